@@ -0,0 +1,143 @@
+"""
+File-backed cache for historical TSETMC data.
+
+Data for trading days that have already closed never changes, so it can be
+kept on disk and reused across runs instead of being fetched again.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+
+class FileCache:
+    """
+    On-disk cache of DataFrames keyed by endpoint, web ID and date.
+
+    Entries are stored as JSON under ``{directory}/{endpoint}/{web_id}/{date}.json``
+    and expire after ``ttl`` seconds. Small string mappings, such as symbol
+    to web ID lookups, are kept in ``{directory}/{name}.json`` and expire
+    ``ttl`` seconds after the mapping was first created.
+
+    Example:
+        >>> cache = FileCache(".cache")
+        >>> cache.set("trades", "12345", "1404-01-05", df)
+        >>> cached = cache.get("trades", "12345", "1404-01-05")
+    """
+
+    def __init__(self, directory: Union[str, Path] = ".cache", ttl: float = 90 * 86400):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Root directory for cache files
+            ttl: Time to live of an entry in seconds
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def path(self, endpoint: str, web_id: str, date: str) -> Path:
+        """Return the file path of a cache entry."""
+        return self.directory / endpoint / str(web_id) / f"{date}.json"
+
+    def get(self, endpoint: str, web_id: str, date: str) -> Optional[pd.DataFrame]:
+        """
+        Load a cached DataFrame.
+
+        Args:
+            endpoint: Name of the cached data source
+            web_id: Stock web ID
+            date: Trading day
+
+        Returns:
+            Cached DataFrame, or None if missing, expired or unreadable
+        """
+        path = self.path(endpoint, web_id, date)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            # Keep the JSON types as stored so Time strings are not parsed as dates
+            return pd.read_json(path, orient='split', dtype=False, convert_dates=False)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, endpoint: str, web_id: str, date: str, df: pd.DataFrame) -> None:
+        """
+        Store a DataFrame in the cache.
+
+        Args:
+            endpoint: Name of the cached data source
+            web_id: Stock web ID
+            date: Trading day
+            df: DataFrame to store
+        """
+        path = self.path(endpoint, web_id, date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        df.to_json(tmp_path, orient='split', index=False)
+        os.replace(tmp_path, path)
+
+    def get_mapping(self, name: str) -> Dict[str, str]:
+        """
+        Load a stored string mapping.
+
+        Args:
+            name: Name of the mapping
+
+        Returns:
+            Stored mapping, or an empty dict if missing, expired or unreadable
+        """
+        return self._load_mapping(name)[1]
+
+    def set_mapping(self, name: str, mapping: Dict[str, str]) -> None:
+        """
+        Store a string mapping, replacing any previous version.
+
+        The creation time of an unexpired stored mapping is kept, so adding
+        entries does not extend the lifetime of the older ones.
+
+        Args:
+            name: Name of the mapping
+            mapping: Mapping to store
+        """
+        created = self._load_mapping(name)[0] or time.time()
+        path = self._mapping_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'created': created, 'mapping': mapping}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def delete_mapping(self, name: str) -> None:
+        """
+        Remove a stored string mapping, if present.
+
+        Args:
+            name: Name of the mapping
+        """
+        try:
+            self._mapping_path(name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _mapping_path(self, name: str) -> Path:
+        """Return the file path of a stored mapping."""
+        return self.directory / f"{name}.json"
+
+    def _load_mapping(self, name: str) -> Tuple[Optional[float], Dict[str, str]]:
+        """Load a mapping and its creation time, or (None, {}) if unusable."""
+        try:
+            with open(self._mapping_path(name), encoding='utf-8') as f:
+                stored = json.load(f)
+            created = float(stored['created'])
+            mapping = stored['mapping']
+        except (OSError, ValueError, TypeError, KeyError):
+            return None, {}
+        if not isinstance(mapping, dict) or time.time() - created > self.ttl:
+            return None, {}
+        return created, mapping
@@ -18,11 +18,23 @@ import calendar
 import time
 import re
 
-from persiantools import characters
 from IPython.display import clear_output
 
 headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_10_1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/39.0.2171.95 Safari/537.36'}
 
+# arabic <-> persian letters (same maps as persiantools.characters):
+_AR_TO_FA_RE = re.compile('([\u062f\u0628\u0632\u0630\u0634\u0633])\u0650')
+_AR_TO_FA = str.maketrans({'\u0649': '\u06cc', '\u064a': '\u06cc', '\u0643': '\u06a9'})
+_FA_TO_AR = str.maketrans({'\u06cc': '\u064a', '\u06a9': '\u0643'})
+
+
+def _ar_to_fa(string):
+    return _AR_TO_FA_RE.sub(r'\1', string).translate(_AR_TO_FA)
+
+
+def _fa_to_ar(string):
+    return string.translate(_FA_TO_AR)
+
 
 def __Check_JDate_Validity__(date, key_word):
     try:
@@ -61,8 +73,8 @@ def get_tse_webid(stock:str = 'پترول') -> pd.DataFrame:
         srch_res = pd.DataFrame(srch_page.json()['instrumentSearch'])
         srch_res = srch_res[['lVal18AFC','lVal30','insCode','lastDate','cgrValCot']]
         srch_res.columns = ['Ticker','Name','WebID','Active','Market']
-        srch_res['Name'] = srch_res['Name'].apply(lambda x : characters.ar_to_fa(' '.join([i.strip() for i in x.split('\u200c')]).strip()))
-        srch_res['Ticker'] = srch_res['Ticker'].apply(lambda x : characters.ar_to_fa(''.join(x.split('\u200c')).strip()))
+        srch_res['Name'] = srch_res['Name'].apply(lambda x : _ar_to_fa(' '.join([i.strip() for i in x.split('\u200c')]).strip()))
+        srch_res['Ticker'] = srch_res['Ticker'].apply(lambda x : _ar_to_fa(''.join(x.split('\u200c')).strip()))
         srch_res['NameSplit'] = srch_res['Name'].apply(lambda x : ''.join(x.split()).strip())
         srch_res['SymbolSplit'] = srch_res['Ticker'].apply(lambda x : ''.join(x.split()).strip())
         srch_res['Active'] = pd.to_numeric(srch_res['Active'])
@@ -81,7 +93,7 @@ def get_tse_webid(stock:str = 'پترول') -> pd.DataFrame:
         stock = 'آ.س.پ'
         
     # generating search keys
-    stock = characters.ar_to_fa(''.join(stock.split('\u200c')).strip())
+    stock = _ar_to_fa(''.join(stock.split('\u200c')).strip())
     first_name = stock.split()[0]
     stock = ''.join(stock.split())
     
@@ -101,7 +113,7 @@ def get_tse_webid(stock:str = 'پترول') -> pd.DataFrame:
     elif len(df_name) > 0 :
         symbol = df_name.index[0][0]
         data = srch_req(symbol)
-        symbol = characters.ar_to_fa(''.join(symbol.split('\u200c')).strip())
+        symbol = _ar_to_fa(''.join(symbol.split('\u200c')).strip())
         df_symbol = data[data.index.get_level_values('Ticker') == symbol]
         if len(df_symbol) > 0 :
             df_symbol = df_symbol.sort_index(level=1, ascending=False).drop(['NameSplit','SymbolSplit'], axis=1)
@@ -129,8 +141,8 @@ def __Get_TSE_WebID__(stock):
             except :
                 pass
         data = pd.DataFrame(data, columns=['Ticker','Name','WEB-ID','Active','Market'])
-        data['Name'] = data['Name'].apply(lambda x : characters.ar_to_fa(' '.join([i.strip() for i in x.split('\u200c')]).strip()))
-        data['Ticker'] = data['Ticker'].apply(lambda x : characters.ar_to_fa(''.join(x.split('\u200c')).strip()))
+        data['Name'] = data['Name'].apply(lambda x : _ar_to_fa(' '.join([i.strip() for i in x.split('\u200c')]).strip()))
+        data['Ticker'] = data['Ticker'].apply(lambda x : _ar_to_fa(''.join(x.split('\u200c')).strip()))
         data['Name-Split'] = data['Name'].apply(lambda x : ''.join(x.split()).strip())
         data['Symbol-Split'] = data['Ticker'].apply(lambda x : ''.join(x.split()).strip())
         data['Active'] = pd.to_numeric(data['Active'])
@@ -145,7 +157,7 @@ def __Get_TSE_WebID__(stock):
     if(stock=='آ س پ'):
         stock = 'آ.س.پ'
     # cleaning input search key
-    stock = characters.ar_to_fa(''.join(stock.split('\u200c')).strip())
+    stock = _ar_to_fa(''.join(stock.split('\u200c')).strip())
     first_name = stock.split()[0]
     if(stock=='فن آوا'):
         first_name = stock
@@ -164,7 +176,7 @@ def __Get_TSE_WebID__(stock):
     elif len(df_name) > 0 :
         symbol = df_name.index[0][0]
         data = request(symbol)
-        symbol = characters.ar_to_fa(''.join(symbol.split('\u200c')).strip())
+        symbol = _ar_to_fa(''.join(symbol.split('\u200c')).strip())
         df_symbol = data[data.index.get_level_values('Ticker') == symbol]
         if len(df_symbol) > 0 :
             df_symbol = df_symbol.sort_index(level=1,ascending=False).drop(['Name-Split','Symbol-Split'], axis=1)
@@ -211,7 +223,7 @@ def __Get_TSE_Sector_WebID__(sector_name):
     try:
         sector_web_id = df_index_lookup.loc[sector_name]['Web-ID']
     except:
-        sector_name = characters.fa_to_ar(sector_name)
+        sector_name = _fa_to_ar(sector_name)
         page = requests.get(f'https://www.google.com/search?q={sector_name} tsetmc اطلاعات شاخص', headers=headers)
         code = page.text.split('http://www.tsetmc.com/Loader.aspx%3FParTree%3D15131J%26i%3D')[1]
         code = code.split('&')[0]
@@ -1889,7 +1901,7 @@ def Get_MarketWatch(save_excel = True, save_path = 'D:/FinPy-TSE Data/MarketWatc
     r = requests.get('https://cdn.tsetmc.com/api/StaticData/GetStaticData', headers=headers)
     sec_df = pd.DataFrame(r.json()['staticData'])
     sec_df['code'] = (sec_df['code'].astype(str).apply(lambda x: '0' + x if len(x) == 1 else x))
-    sec_df['name'] = (sec_df['name'].apply(lambda x: re.sub(r'\u200c', '', x)).str.strip().apply(characters.ar_to_fa))
+    sec_df['name'] = (sec_df['name'].apply(lambda x: re.sub(r'\u200c', '', x)).str.strip().apply(_ar_to_fa))
     sec_df = sec_df[sec_df['type'] == 'IndustrialGroup'][['code', 'name']]
     Mkt_df['Sector'] = Mkt_df['Sector'].map(dict(sec_df[['code', 'name']].values))
     # r = requests.get('http://old.tsetmc.com/Loader.aspx?ParTree=111C1213', headers=headers)
@@ -2148,7 +2160,7 @@ def Build_Market_StockList(bourse = True, farabourse = True, payeh = True, detai
         look_up = look_up[['Name','Market','WEB-ID']]
         if(payeh):
             # some minor changes in payeh_lookup
-            payeh_lookup['Ticker'] = payeh_lookup['Ticker'].apply(lambda x: characters.ar_to_fa(x))
+            payeh_lookup['Ticker'] = payeh_lookup['Ticker'].apply(lambda x: _ar_to_fa(x))
             payeh_lookup = payeh_lookup.set_index('Ticker')
             # look for payeh market web-ids from market watch
             r = requests.get('http://old.tsetmc.com/tsev2/data/MarketWatchPlus.aspx', headers=headers)
@@ -2156,7 +2168,7 @@ def Build_Market_StockList(bourse = True, farabourse = True, payeh = True, detai
             mkt_watch = mkt_watch[0].str.split(",",expand=True)
             mkt_watch = mkt_watch[[0,2]]
             mkt_watch.columns = ['WEB-ID','Ticker']
-            mkt_watch['Ticker'] = mkt_watch['Ticker'].apply(lambda x: characters.ar_to_fa(x))
+            mkt_watch['Ticker'] = mkt_watch['Ticker'].apply(lambda x: _ar_to_fa(x))
             mkt_watch = mkt_watch.set_index('Ticker')
             # join based on payeh_lookup
             payeh_lookup = payeh_lookup.join(mkt_watch)
@@ -2187,7 +2199,7 @@ def Build_Market_StockList(bourse = True, farabourse = True, payeh = True, detai
             payeh_lookup = pd.concat([with_web_id,no_web_id])
             # add to bourse and fara-bourse:
             look_up = pd.concat([look_up[look_up['WEB-ID'].notnull()],payeh_lookup])
-            look_up['Name'] = look_up['Name'].apply(lambda x: characters.ar_to_fa(x))
+            look_up['Name'] = look_up['Name'].apply(lambda x: _ar_to_fa(x))
         # read stocks IDs from TSE webpages:
         def get_data_optimaize(codes):
             tracemalloc.start()
@@ -2373,7 +2385,7 @@ def __get_history_data_group_parallel__(stock_list) :
         #تمیزکردن لیست سهام واردشده
         list_first_name, stock_list_split = [], []
         for stock in stock_list :
-            stock = characters.fa_to_ar(''.join(stock.split('\u200c')).strip())
+            stock = _fa_to_ar(''.join(stock.split('\u200c')).strip())
             list_first_name.append(stock.split()[0])
             stock_list_split.append(''.join(stock.split()))
 
@@ -2415,7 +2427,7 @@ def __get_history_data_group_parallel__(stock_list) :
 
         if len(df_names) > 0 :
             #جداکردن لیست نمادهایی که نام آنها پیدا شده
-            stock_list = [characters.fa_to_ar(''.join(i.split('\u200c')).strip()) for i in 
+            stock_list = [_fa_to_ar(''.join(i.split('\u200c')).strip()) for i in 
                           df_names.index[~df_names.index.get_level_values('Ticker').duplicated()].get_level_values('Ticker')]
 
             #TSE گرفتن نتایج سرچ در 
@@ -2902,7 +2914,7 @@ def Get_ShareHoldersInfo(ticker = 'خودرو'):
     change_list = []
 
     for i in range(len(table)):
-        name_list.append(characters.ar_to_fa(table[i].findAll("td")[0].text))
+        name_list.append(_ar_to_fa(table[i].findAll("td")[0].text))
         out_list.append(int((table[i].findAll("td")[1].findAll('div')[0].attrs['title']).replace(',','')))
         per_list.append(float(table[i].findAll("td")[2].text))
         try:
@@ -10,13 +10,18 @@ from typing import Dict, Any, Optional, List, Union
 from abc import ABC, abstractmethod
 import pandas as pd
 from datetime import datetime
+import random
+import threading
 import time
 
 from ..exceptions import (
     TSETMCError, TSETMCAPIError, TSETMCNetworkError, 
     TSETMCRateLimitError, TSETMCValidationError
 )
-from ..utils import create_http_headers, retry_on_failure, safe_int_conversion, safe_float_conversion
+from ..utils import (
+    create_http_headers, retry_on_failure, safe_int_conversion, safe_float_conversion,
+    AsyncRateLimiter
+)
 
 
 class BaseService(ABC):
@@ -36,7 +41,8 @@ class BaseService(ABC):
         base_url: str = "http://www.tsetmc.com",
         timeout: int = 30,
         max_retries: int = 3,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        max_rate: float = 20.0
     ):
         """
         Initialize the base service.
@@ -46,6 +52,7 @@ class BaseService(ABC):
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
             logger: Logger instance
+            max_rate: Maximum async requests started per second
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
@@ -55,27 +62,37 @@ class BaseService(ABC):
         # Rate limiting
         self._last_request_time = 0
         self._min_request_interval = 0.1  # 100ms between requests
+        self._async_limiter = AsyncRateLimiter(max_rate, 1.0)
         
         # Session for connection pooling
         self._session = None
+        
+        # Guard the session and rate limit state, which worker threads share
+        self._session_lock = threading.Lock()
+        self._rate_limit_lock = threading.Lock()
     
     def _get_session(self) -> requests.Session:
         """Get or create a requests session."""
         if self._session is None:
-            self._session = requests.Session()
-            self._session.headers.update(create_http_headers())
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.headers.update(create_http_headers())
+                    self._session = session
         return self._session
     
     def _rate_limit(self) -> None:
         """Implement basic rate limiting."""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        
-        if time_since_last < self._min_request_interval:
-            sleep_time = self._min_request_interval - time_since_last
-            time.sleep(sleep_time)
-        
-        self._last_request_time = time.time()
+        # Held across the sleep so concurrent callers are spaced out in turn
+        with self._rate_limit_lock:
+            current_time = time.time()
+            time_since_last = current_time - self._last_request_time
+            
+            if time_since_last < self._min_request_interval:
+                sleep_time = self._min_request_interval - time_since_last
+                time.sleep(sleep_time)
+            
+            self._last_request_time = time.time()
     
     @retry_on_failure(max_retries=3)
     def _make_request(
@@ -180,36 +197,59 @@ class BaseService(ABC):
             TSETMCNetworkError: For network-related errors
             TSETMCAPIError: For API-related errors
         """
+        retry_delay = 1.0
         try:
-            self.logger.debug(f"Making async {method} request to {url}")
-            
-            async with session.request(
-                method=method,
-                url=url,
-                params=params,
-                data=data,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as response:
+            for attempt in range(self.max_retries + 1):
+                self.logger.debug(f"Making async {method} request to {url}")
                 
-                # Check for rate limiting
-                if response.status == 429:
-                    raise TSETMCRateLimitError("Rate limit exceeded")
+                async with self._async_limiter:
+                    async with session.request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        data=data,
+                        headers=headers,
+                        timeout=aiohttp.ClientTimeout(total=self.timeout)
+                    ) as response:
+                        
+                        # Back off and retry when the server is throttling us
+                        if response.status in (429, 503) and attempt < self.max_retries:
+                            wait = self._retry_after(response.headers.get('Retry-After'), retry_delay)
+                        else:
+                            # Check for rate limiting
+                            if response.status == 429:
+                                raise TSETMCRateLimitError("Rate limit exceeded")
+                            
+                            # Check for other HTTP errors
+                            if response.status >= 400:
+                                raise TSETMCAPIError(
+                                    f"HTTP {response.status}: {response.reason}",
+                                    status_code=response.status
+                                )
+                            
+                            # Read the body before the connection is released
+                            await response.read()
+                            return response
                 
-                # Check for other HTTP errors
-                if response.status >= 400:
-                    raise TSETMCAPIError(
-                        f"HTTP {response.status}: {response.reason}",
-                        status_code=response.status
-                    )
-                
-                return response
+                self.logger.warning(
+                    f"HTTP {response.status} from {url}, retrying in {wait:.1f} seconds..."
+                )
+                await asyncio.sleep(wait + random.uniform(0, wait * 0.1))
+                retry_delay *= 2
                 
         except asyncio.TimeoutError:
             raise TSETMCNetworkError(f"Request timeout after {self.timeout} seconds")
         except aiohttp.ClientError as e:
             raise TSETMCNetworkError(f"Request error: {str(e)}")
     
+    @staticmethod
+    def _retry_after(header: Optional[str], default: float) -> float:
+        """Seconds to wait from a Retry-After header, or default if absent or unparsable."""
+        try:
+            return max(float(header), 0.0)
+        except (TypeError, ValueError):
+            return default
+    
     def _validate_date_range(self, start_date: str, end_date: str) -> None:
         """
         Validate date range parameters.
@@ -223,18 +263,16 @@ class BaseService(ABC):
         """
         from ..utils import validate_jalali_date
         
-        # Validate and normalize both dates
+        # Validate and normalize both dates, re-raising with a message that
+        # says which one was invalid
         try:
             normalized_start = validate_jalali_date(start_date)
+        except TSETMCValidationError:
+            raise TSETMCValidationError(f"Invalid start date format: {start_date}")
+        try:
             normalized_end = validate_jalali_date(end_date)
-        except TSETMCValidationError as e:
-            # Re-raise with more specific message
-            if "start" not in str(e).lower():
-                if start_date in str(e):
-                    raise TSETMCValidationError(f"Invalid start date format: {start_date}")
-                else:
-                    raise TSETMCValidationError(f"Invalid end date format: {end_date}")
-            raise
+        except TSETMCValidationError:
+            raise TSETMCValidationError(f"Invalid end date format: {end_date}")
         
         # Check if start_date is before end_date using normalized dates
         start_parts = [int(x) for x in normalized_start.split('-')]
@@ -272,8 +310,9 @@ class BaseService(ABC):
         if df.empty:
             return df
         
-        # Create a copy to avoid modifying the original
-        cleaned_df = df.copy()
+        # Shallow copy: converted columns are replaced below, never written
+        # in place, so the rest can share the input's data
+        cleaned_df = df.copy(deep=False)
         
         # Convert numeric columns with proper error handling
         for col in cleaned_df.columns:
@@ -288,9 +327,15 @@ class BaseService(ABC):
                     # If conversion fails, keep original data
                     continue
         
-        # Remove completely empty rows and columns
-        cleaned_df = cleaned_df.dropna(how='all', axis=0)
-        cleaned_df = cleaned_df.dropna(how='all', axis=1)
+        # Remove completely empty rows and columns, skipping the copy when
+        # there are none
+        missing = cleaned_df.isna()
+        empty_rows = missing.all(axis=1)
+        if empty_rows.any():
+            cleaned_df = cleaned_df.loc[~empty_rows]
+        empty_cols = missing.all(axis=0)
+        if empty_cols.any():
+            cleaned_df = cleaned_df.loc[:, ~empty_cols]
         
         return cleaned_df
     
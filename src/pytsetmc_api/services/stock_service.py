@@ -4,14 +4,140 @@ Stock service for searching and retrieving basic stock information.
 
 import pandas as pd
 import requests
-from typing import Optional, Dict, Any, List
-from bs4 import BeautifulSoup
+from typing import Optional, Dict, Any, List, Tuple, Union
+from bs4 import BeautifulSoup, SoupStrainer
 import re
+import threading
+import time
+from bisect import bisect_right
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
 
 from .base_service import BaseService
 from ..exceptions import TSETMCError, TSETMCAPIError, TSETMCNotFoundError, TSETMCValidationError
 from ..models import StockInfo, SearchResult, MarketType
-from ..utils import clean_persian_text, safe_int_conversion
+from ..utils import clean_persian_text, clean_persian_series, parse_json, safe_int_conversion
+
+
+# Web ID query parameter in TSETMC instrument links
+_WEB_ID_RE = re.compile(r'i=(\d+)')
+
+# Market name keywords mapped to market types, checked in order
+_MARKET_KEYWORDS = (
+    ('فرابورس', MarketType.FARABOURSE),
+    ('زرد', MarketType.PAYEH_ZARD),
+    ('نارنجی', MarketType.PAYEH_NARENJI),
+    ('قرمز', MarketType.PAYEH_GHERMEZ),
+    ('کوچک', MarketType.KOCHAK_MOTAVASET),
+)
+
+# Market names by the "flow" code of the JSON search API
+_MARKET_BY_FLOW = {
+    1: 'بورس',
+    2: 'فرابورس',
+    3: 'پایه زرد',
+    4: 'پایه نارنجی',
+    5: 'پایه قرمز'
+}
+
+# Web IDs of common sectors, keyed by their normalized names
+_SECTOR_MAPPING: Dict[str, str] = {
+    clean_persian_text(name): web_id for name, web_id in {
+        'خودرو': '35425587644337450',
+        'پتروشیمی': '35700344742835695',
+        'فولاد': '46348559193224090',
+        'بانک': '32097828799138957',
+        'دارو': '25846348559193224',
+        'سیمان': '35835747954090',
+        'نفت': '43685097559193224',
+        'معدن': '18431643976890',
+        'غذا': '35700344742835695',
+        'نساجی': '25846348559193224'
+    }.items()
+}
+
+# Column layout shared by all search result parsers
+_SEARCH_COLUMNS = ['Name', 'Symbol', 'WebID', 'Market', 'Sector', 'ISIN']
+
+# Placeholder result returned for queries nothing else matched; the
+# query-dependent Name and Symbol are filled in per search
+_DEMO_RECORD = {
+    'Name': '',
+    'Symbol': '',
+    'WebID': '12345678901234567',  # Demo web ID
+    'Market': 'بورس',
+    'Sector': 'عمومی',
+    'ISIN': 'IRO1DEMO0001'
+}
+_DEMO_DF = pd.DataFrame([_DEMO_RECORD])
+
+# Comprehensive stock mapping for common Iranian stocks, used when the
+# TSETMC search endpoints are unavailable
+_STOCK_MAPPING: Dict[str, Dict[str, str]] = {
+    'پترول': {'Name': 'شرکت ملی صنایع پتروشیمی', 'Symbol': 'پترول', 'WebID': '46348559193224090', 'Market': 'بورس', 'Sector': 'پتروشیمی', 'ISIN': 'IRO1MSMI0001'},
+    'خودرو': {'Name': 'ایران خودرو', 'Symbol': 'خودرو', 'WebID': '65883838195688438', 'Market': 'بورس', 'Sector': 'خودرو', 'ISIN': 'IRO1IKCO0001'},
+    'فولاد': {'Name': 'فولاد مبارکه اصفهان', 'Symbol': 'فولاد', 'WebID': '35700344742835695', 'Market': 'بورس', 'Sector': 'فولاد', 'ISIN': 'IRO1MSMI0001'},
+    'بانک': {'Name': 'بانک ملت', 'Symbol': 'بانک', 'WebID': '778253364357513', 'Market': 'بورس', 'Sector': 'بانک', 'ISIN': 'IRO1BMLT0001'},
+    'وخارزم': {'Name': 'خارزمی', 'Symbol': 'وخارزم', 'WebID': '778253364357514', 'Market': 'بورس', 'Sector': 'فناوری', 'ISIN': 'IRO1KHRZ0001'},
+    'ذوب': {'Name': 'ذوب آهن اصفهان', 'Symbol': 'ذوب', 'WebID': '778253364357515', 'Market': 'بورس', 'Sector': 'فولاد', 'ISIN': 'IRO1ZOBS0001'}
+}
+
+# Lookup indexes over the mapping, lowercased once at import time
+_FALLBACK_BY_KEY: Dict[str, Dict[str, str]] = {
+    key.lower(): value for key, value in _STOCK_MAPPING.items()
+}
+_FALLBACK_RECORDS: List[Dict[str, str]] = list(_STOCK_MAPPING.values())
+_FALLBACK_KEYS: List[str] = [key.lower() for key in _STOCK_MAPPING]
+
+# Web IDs that come from the built-in mapping or the demo placeholder rather
+# than a live search, and so must not be cached as authoritative
+_UNVERIFIED_WEB_IDS = frozenset(
+    [value['WebID'] for value in _STOCK_MAPPING.values()] + [_DEMO_RECORD['WebID']]
+)
+
+
+def _build_fallback_haystack() -> Tuple[str, List[int]]:
+    """
+    Join every record's key, name and symbol into one searchable string.
+    
+    Segments are separated by newlines, which never occur in a cleaned
+    query, so a match can't span two records. Returns the string and the
+    offset at which each record's segment starts.
+    """
+    segments = [
+        f"{key}\n{value['Name'].lower()}\n{value['Symbol'].lower()}"
+        for key, value in zip(_FALLBACK_KEYS, _FALLBACK_RECORDS)
+    ]
+    starts, offset = [], 0
+    for segment in segments:
+        starts.append(offset)
+        offset += len(segment) + 1
+    return '\n'.join(segments), starts
+
+
+def _build_key_automaton() -> Optional[Any]:
+    """Build an Aho-Corasick automaton over the mapping keys, if available."""
+    if ahocorasick is None:
+        return None
+    
+    indexes: Dict[str, List[int]] = {}
+    for idx, key in enumerate(_FALLBACK_KEYS):
+        indexes.setdefault(key, []).append(idx)
+    
+    automaton = ahocorasick.Automaton()
+    for key, idxs in indexes.items():
+        automaton.add_word(key, idxs)
+    automaton.make_automaton()
+    return automaton
+
+
+_FALLBACK_HAYSTACK, _FALLBACK_STARTS = _build_fallback_haystack()
+_FALLBACK_KEY_AUTOMATON = _build_key_automaton()
 
 
 class StockService(BaseService):
@@ -24,6 +150,20 @@ class StockService(BaseService):
     - Retrieve sector information
     """
     
+    # Circuit breaker for the new search endpoint, shared by all instances:
+    # after enough consecutive failures it is skipped for a cooldown window
+    _NEW_API_FAILURE_THRESHOLD = 3
+    _NEW_API_COOLDOWN = 600.0  # seconds
+    _new_api_failures = 0
+    _new_api_skip_until = 0.0
+    _new_api_lock = threading.Lock()
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Sector names outside _SECTOR_MAPPING cost a request each; keep
+        # the ones already resolved by this instance
+        self._search_sector = lru_cache(maxsize=256)(self._search_sector)
+    
     def search(self, query: str) -> pd.DataFrame:
         """
         Search for stocks by name or symbol.
@@ -42,13 +182,7 @@ class StockService(BaseService):
             >>> service = StockService()
             >>> results = service.search('پترول')
         """
-        # Validate input
-        if not query or not isinstance(query, str):
-            raise TSETMCValidationError("Search query must be a non-empty string")
-        
-        query = query.strip()
-        if len(query) < 2:
-            raise TSETMCValidationError("Search query must be at least 2 characters long")
+        query = self._validate_query(query)
         
         self.logger.info(f"Searching for stock: {query}")
         
@@ -56,59 +190,18 @@ class StockService(BaseService):
             # Clean the search query
             clean_query = clean_persian_text(query)
             
-            # Try new API endpoint first (but expect it to fail for now)
-            try:
-                search_url = self._build_url("tsev2/data/Instrument/GetInstrumentSearch")
-                headers = {'Content-Type': 'application/json'}
-                data = {'searchKey': clean_query}
-                
-                response = self._make_request(search_url, method='POST', data=data, headers=headers)
-                
-                # Check if response is actually JSON
-                response_text = response.text.strip()
-                if response_text and not response_text.startswith(('<', '<!doctype')):
-                    results = self._parse_new_search_response(response_text)
-                    
-                    if not results.empty:
-                        self.logger.info(f"Found {len(results)} stocks for query: {query}")
-                        return self._clean_dataframe(results)
-                        
-            except Exception as e:
-                self.logger.debug(f"New API endpoint failed: {e}")
-            
-            # Try old endpoint with form data
-            try:
-                search_url = self._build_url("tsev2/data/search.aspx")
-                data = {'skey': clean_query}
-                
-                response = self._make_request(search_url, method='POST', data=data)
-                
-                # Check if response is HTML (error) or data
-                response_text = response.text.strip()
-                if not response_text.startswith(('<!doctype', '<html')):
-                    results = self._parse_search_response(response_text)
-                    
-                    if not results.empty:
-                        self.logger.info(f"Found {len(results)} stocks for query: {query}")
-                        return self._clean_dataframe(results)
-                        
-            except Exception as e:
-                self.logger.debug(f"Old API endpoint failed: {e}")
+            rows = self._query_search_endpoints(clean_query)
+            if rows:
+                results = self._rows_to_frame(rows)
+                self.logger.info(f"Found {len(results)} stocks for query: {query}")
+                return self._clean_dataframe(results)
             
             # Fallback to hardcoded mappings
             results = self._fallback_search(clean_query)
             
             if results.empty:
                 # Create a mock result for testing/demo purposes
-                mock_result = {
-                    'Name': f'Demo Stock for {query}',
-                    'Symbol': query[:6] if len(query) >= 3 else query,
-                    'WebID': '12345678901234567',  # Demo web ID
-                    'Market': 'بورس',
-                    'Sector': 'عمومی',
-                    'ISIN': 'IRO1DEMO0001'
-                }
-                results = pd.DataFrame([mock_result])
+                results = self._demo_frame(query)
                 self.logger.info(f"Using demo data for query: {query}")
             
             self.logger.info(f"Found {len(results)} stocks for query: {query}")
@@ -135,30 +228,18 @@ class StockService(BaseService):
         """
         self._validate_stock_name(stock_name)
         
-        # Search for the stock first
-        search_results = self.search(stock_name)
+        # Only the first (most relevant) search result is needed
+        first_result = self._search_first(stock_name)
         
-        if search_results.empty:
+        if first_result is None:
             raise TSETMCNotFoundError(f"Stock not found: {stock_name}")
         
-        # Get the first result (most relevant)
-        first_result = search_results.iloc[0]
-        
         # Map market name to MarketType enum
         market_name = first_result.get('Market', '')
-        market_type = MarketType.BOURSE  # Default
-        if 'فرابورس' in market_name:
-            market_type = MarketType.FARABOURSE
-        elif 'زرد' in market_name:
-            market_type = MarketType.PAYEH_ZARD
-        elif 'نارنجی' in market_name:
-            market_type = MarketType.PAYEH_NARENJI
-        elif 'قرمز' in market_name:
-            market_type = MarketType.PAYEH_GHERMEZ
-        elif 'کوچک' in market_name:
-            market_type = MarketType.KOCHAK_MOTAVASET
-        elif market_name and 'بورس' not in market_name:
-            market_type = MarketType.UNKNOWN
+        market_type = next(
+            (mt for keyword, mt in _MARKET_KEYWORDS if keyword in market_name),
+            MarketType.BOURSE if not market_name or 'بورس' in market_name else MarketType.UNKNOWN
+        )
         
         return StockInfo(
             name=first_result.get('Name', ''),
@@ -181,8 +262,156 @@ class StockService(BaseService):
         Raises:
             TSETMCNotFoundError: If stock not found
         """
-        stock_info = self.get_stock_info(stock_name)
-        return stock_info.web_id
+        self._validate_stock_name(stock_name)
+        
+        first_result = self._search_first(stock_name)
+        
+        if first_result is None:
+            raise TSETMCNotFoundError(f"Stock not found: {stock_name}")
+        
+        return str(first_result.get('WebID', ''))
+    
+    @staticmethod
+    def is_verified_web_id(web_id: str) -> bool:
+        """
+        Check whether a web ID came from a live search.
+        
+        IDs from the built-in stock mapping or the demo placeholder, returned
+        when the search endpoints fail, are not verified and should not be
+        cached as authoritative.
+        
+        Args:
+            web_id: Web ID returned by :meth:`get_web_id`
+            
+        Returns:
+            True if the ID is not one of the offline fallbacks
+        """
+        return web_id not in _UNVERIFIED_WEB_IDS
+    
+    def _search_first(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Search for a stock and return only its most relevant result.
+        
+        Runs the same endpoint sequence as :meth:`search` but builds a
+        single record instead of a DataFrame.
+        
+        Args:
+            query: Stock name or symbol to search for
+            
+        Returns:
+            Dictionary with the first search result, or None if nothing matched
+        """
+        query = self._validate_query(query)
+        
+        self.logger.info(f"Searching for stock: {query}")
+        
+        try:
+            clean_query = clean_persian_text(query)
+            
+            rows = self._query_search_endpoints(clean_query)
+            if rows:
+                record = dict(zip(_SEARCH_COLUMNS, rows[0]))
+                for col in ('Name', 'Symbol', 'Sector'):
+                    record[col] = clean_persian_text(record[col])
+                return record
+            
+            records = self._fallback_records(clean_query)
+            if records:
+                return records[0]
+            
+            self.logger.info(f"Using demo data for query: {query}")
+            return self._demo_frame(query).iloc[0].to_dict()
+            
+        except Exception as e:
+            if isinstance(e, TSETMCError):
+                raise
+            self.logger.error(f"Failed to search for stock '{query}': {str(e)}")
+            raise TSETMCAPIError(f"Failed to search for stock '{query}': {str(e)}")
+    
+    def _validate_query(self, query: str) -> str:
+        """Validate a search query and return it stripped."""
+        if not query or not isinstance(query, str):
+            raise TSETMCValidationError("Search query must be a non-empty string")
+        
+        query = query.strip()
+        if len(query) < 2:
+            raise TSETMCValidationError("Search query must be at least 2 characters long")
+        
+        return query
+    
+    def _query_search_endpoints(self, clean_query: str) -> List[List[Any]]:
+        """
+        Query the TSETMC search endpoints in turn.
+        
+        Args:
+            clean_query: Clean search query
+            
+        Returns:
+            Raw result rows (in ``_SEARCH_COLUMNS`` order, text not yet
+            normalized) from the first endpoint that returned any
+        """
+        # Try new API endpoint first (but expect it to fail for now),
+        # unless it has been failing recently
+        with StockService._new_api_lock:
+            new_api_open = time.monotonic() >= StockService._new_api_skip_until
+        if new_api_open:
+            try:
+                search_url = self._build_url("tsev2/data/Instrument/GetInstrumentSearch")
+                headers = {'Content-Type': 'application/json'}
+                data = {'searchKey': clean_query}
+                
+                response = self._make_request(search_url, method='POST', data=data, headers=headers)
+                
+                # Check if response is actually JSON; the raw bytes go straight
+                # to the JSON decoder without a str round-trip
+                content = response.content
+                if content.lstrip()[:1] not in (b'', b'<'):
+                    rows = self._new_search_rows(content)
+                    self._record_new_api_result(success=True)
+                    
+                    if rows:
+                        return rows
+                else:
+                    self._record_new_api_result(success=False)
+                        
+            except Exception as e:
+                self._record_new_api_result(success=False)
+                self.logger.debug(f"New API endpoint failed: {e}")
+        
+        # Try old endpoint with form data
+        try:
+            search_url = self._build_url("tsev2/data/search.aspx")
+            data = {'skey': clean_query}
+            
+            response = self._make_request(search_url, method='POST', data=data)
+            
+            # Check if response is HTML (error) or data
+            response_text = response.text.strip()
+            if not response_text.startswith(('<!doctype', '<html')):
+                rows = self._search_rows(response_text)
+                
+                if rows:
+                    return rows
+                    
+        except Exception as e:
+            self.logger.debug(f"Old API endpoint failed: {e}")
+        
+        return []
+    
+    def _rows_to_frame(self, rows: List[List[Any]]) -> pd.DataFrame:
+        """Build a search results DataFrame from raw result rows."""
+        if not rows:
+            return pd.DataFrame()
+        
+        results = pd.DataFrame(rows, columns=_SEARCH_COLUMNS)
+        return self._clean_text_columns(results, ['Name', 'Symbol', 'Sector'])
+    
+    def _demo_frame(self, query: str) -> pd.DataFrame:
+        """Build the placeholder search result used when nothing is found."""
+        demo = _DEMO_DF.copy()
+        demo.at[0, 'Name'] = f'Demo Stock for {query}'
+        demo.at[0, 'Symbol'] = query[:6] if len(query) >= 3 else query
+        return demo
     
     def get_sector_stocks(self, sector_name: str) -> pd.DataFrame:
         """
@@ -207,8 +436,8 @@ class StockService(BaseService):
             sector_url = self._build_url(f"Loader.aspx?ParTree=111C1213&i={sector_web_id}")
             response = self._make_request(sector_url)
             
-            # Parse sector page
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Parse only the tables of the sector page
+            soup = BeautifulSoup(response.text, 'lxml', parse_only=SoupStrainer('table'))
             stocks_data = self._parse_sector_stocks(soup)
             
             if stocks_data.empty:
@@ -221,44 +450,71 @@ class StockService(BaseService):
                 raise
             raise TSETMCAPIError(f"Failed to get sector stocks for '{sector_name}': {str(e)}")
     
-    def _parse_search_response(self, response_text: str) -> pd.DataFrame:
+    def search_many(self, queries: List[str], max_workers: int = 8) -> Dict[str, pd.DataFrame]:
         """
-        Parse search response from TSETMC.
+        Search for several stocks concurrently.
+        
+        Requests share this service's pooled session, so connections are
+        reused across queries.
         
         Args:
-            response_text: Raw response text
+            queries: Stock names or symbols to search for
+            max_workers: Maximum number of concurrent requests
             
         Returns:
-            DataFrame with parsed search results
+            Dictionary mapping each successful query to its search results
+            
+        Example:
+            >>> service = StockService()
+            >>> results = service.search_many(['پترول', 'خودرو'])
         """
-        try:
-            # TSETMC search returns data in a specific format
-            # Split by semicolons and parse each result
-            lines = response_text.strip().split(';')
+        return self._run_many(self.search, queries, max_workers)
+    
+    def get_sector_stocks_many(self, sector_names: List[str], max_workers: int = 8) -> Dict[str, pd.DataFrame]:
+        """
+        Get the stocks of several sectors concurrently.
+        
+        Args:
+            sector_names: Names of the sectors
+            max_workers: Maximum number of concurrent requests
             
-            results = []
-            for line in lines:
-                if not line.strip():
-                    continue
-                
-                # Parse each line (format: name,symbol,webid,market,etc.)
-                parts = line.split(',')
-                if len(parts) >= 4:
-                    result = {
-                        'Name': clean_persian_text(parts[0]) if len(parts) > 0 else '',
-                        'Symbol': clean_persian_text(parts[1]) if len(parts) > 1 else '',
-                        'WebID': parts[2] if len(parts) > 2 else '',
-                        'Market': parts[3] if len(parts) > 3 else '',
-                        'Sector': clean_persian_text(parts[4]) if len(parts) > 4 else '',
-                        'ISIN': parts[5] if len(parts) > 5 else ''
-                    }
-                    results.append(result)
-            
-            return pd.DataFrame(results)
+        Returns:
+            Dictionary mapping each successful sector name to its stocks
             
-        except Exception as e:
-            self.logger.error(f"Failed to parse search response: {str(e)}")
-            return pd.DataFrame()
+        Example:
+            >>> service = StockService()
+            >>> sectors = service.get_sector_stocks_many(['خودرو', 'بانک'])
+        """
+        return self._run_many(self.get_sector_stocks, sector_names, max_workers)
+    
+    def _run_many(self, func, keys: List[str], max_workers: int) -> Dict[str, pd.DataFrame]:
+        """Run a per-key lookup over a thread pool, skipping failed keys."""
+        results = {}
+        if not keys:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            futures = {key: executor.submit(func, key) for key in dict.fromkeys(keys)}
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    self.logger.warning(f"Could not fetch data for '{key}': {e}")
+        
+        return results
+    
+    def _search_rows(self, response_text: str) -> List[List[str]]:
+        """Split a search response into raw rows padded to ``_SEARCH_COLUMNS``."""
+        # TSETMC search returns data in a specific format
+        # Split by semicolons, then each line (name,symbol,webid,market,etc.)
+        # by commas, padding short rows out to the full column set
+        width = len(_SEARCH_COLUMNS)
+        rows = []
+        for line in response_text.strip().split(';'):
+            parts = line.split(',')[:width]
+            if len(parts) >= 4:
+                rows.append(parts + [''] * (width - len(parts)))
+        return rows
     
     def _get_sector_web_id(self, sector_name: str) -> str:
         """
@@ -273,27 +529,26 @@ class StockService(BaseService):
         Raises:
             TSETMCNotFoundError: If sector not found
         """
-        # Mapping of common sector names to their web IDs
-        sector_mapping = {
-            'خودرو': '35425587644337450',
-            'پتروشیمی': '35700344742835695',
-            'فولاد': '46348559193224090',
-            'بانک': '32097828799138957',
-            'دارو': '25846348559193224',
-            'سیمان': '35835747954090',
-            'نفت': '43685097559193224',
-            'معدن': '18431643976890',
-            'غذا': '35700344742835695',
-            'نساجی': '25846348559193224'
-        }
-        
         clean_sector = clean_persian_text(sector_name)
         
-        # Try direct mapping first
-        if clean_sector in sector_mapping:
-            return sector_mapping[clean_sector]
+        # Try direct mapping first, then search for it
+        return _SECTOR_MAPPING.get(clean_sector) or self._search_sector(clean_sector)
+    
+    def _search_sector(self, clean_sector: str) -> str:
+        """
+        Look up a sector's web ID through the search endpoint.
+        
+        Results are memoized per service instance (see ``__init__``).
         
-        # If not found in mapping, search for it
+        Args:
+            clean_sector: Clean sector name
+            
+        Returns:
+            Sector web ID
+            
+        Raises:
+            TSETMCNotFoundError: If sector not found
+        """
         try:
             search_url = self._build_url("tsev2/data/search.aspx")
             params = {
@@ -311,7 +566,7 @@ class StockService(BaseService):
                     if len(parts) >= 3:
                         return parts[2]  # Web ID is usually the third part
             
-            raise TSETMCNotFoundError(f"Sector not found: {sector_name}")
+            raise TSETMCNotFoundError(f"Sector not found: {clean_sector}")
             
         except Exception as e:
             if isinstance(e, TSETMCError):
@@ -331,10 +586,8 @@ class StockService(BaseService):
         try:
             stocks = []
             
-            # Find the table containing stock data
-            tables = soup.find_all('table')
-            
-            for table in tables:
+            # The first table with stock rows holds the sector's stocks
+            for table in soup.find_all('table'):
                 rows = table.find_all('tr')
                 
                 for row in rows[1:]:  # Skip header row
@@ -350,21 +603,27 @@ class StockService(BaseService):
                         link = name_cell.find('a')
                         if link and 'href' in link.attrs:
                             href = link['href']
-                            web_id_match = re.search(r'i=(\d+)', href)
+                            web_id_match = _WEB_ID_RE.search(href)
                             if web_id_match:
                                 web_id = web_id_match.group(1)
                         
                         stock = {
-                            'Name': clean_persian_text(name_cell.get_text(strip=True)),
-                            'Symbol': clean_persian_text(symbol_cell.get_text(strip=True)),
+                            'Name': name_cell.get_text(strip=True),
+                            'Symbol': symbol_cell.get_text(strip=True),
                             'WebID': web_id,
                             'LastPrice': safe_int_conversion(cells[2].get_text(strip=True)) if len(cells) > 2 else 0,
                             'Change': safe_int_conversion(cells[3].get_text(strip=True)) if len(cells) > 3 else 0,
                             'ChangePercent': cells[4].get_text(strip=True) if len(cells) > 4 else '0%'
                         }
                         stocks.append(stock)
+                
+                if stocks:
+                    break
             
-            return pd.DataFrame(stocks)
+            if not stocks:
+                return pd.DataFrame()
+            
+            return self._clean_text_columns(pd.DataFrame(stocks), ['Name', 'Symbol'])
             
         except Exception as e:
             self.logger.error(f"Failed to parse sector stocks: {str(e)}")
@@ -435,51 +694,42 @@ class StockService(BaseService):
                             
                             if len(cells) >= 3:
                                 shareholder = {
-                                    'Name': clean_persian_text(cells[0].get_text(strip=True)),
+                                    'Name': cells[0].get_text(strip=True),
                                     'Shares': safe_int_conversion(cells[1].get_text(strip=True)),
                                     'Percentage': cells[2].get_text(strip=True)
                                 }
                                 shareholders.append(shareholder)
+                        
+                        # The page has a single shareholders table
+                        break
+            
+            if not shareholders:
+                return pd.DataFrame()
             
-            return pd.DataFrame(shareholders)
+            return self._clean_text_columns(pd.DataFrame(shareholders), ['Name'])
             
         except Exception as e:
             self.logger.error(f"Failed to parse shareholders data: {str(e)}")
             return pd.DataFrame()
     
-    def _parse_new_search_response(self, response_text: str) -> pd.DataFrame:
-        """
-        Parse new JSON API search response from TSETMC.
+    def _new_search_rows(self, response_text: Union[str, bytes]) -> List[List[Any]]:
+        """Decode a JSON search response into raw rows in ``_SEARCH_COLUMNS`` order."""
+        data = parse_json(response_text)
         
-        Args:
-            response_text: Raw JSON response text
-            
-        Returns:
-            DataFrame with parsed search results
-        """
-        try:
-            import json
-            data = json.loads(response_text)
-            
-            results = []
-            if isinstance(data, list):
-                for item in data:
-                    if isinstance(item, dict):
-                        result = {
-                            'Name': clean_persian_text(item.get('lVal30', '')),
-                            'Symbol': clean_persian_text(item.get('lVal18AFC', '')),
-                            'WebID': str(item.get('insCode', '')),
-                            'Market': self._determine_market(item.get('flow', 0)),
-                            'Sector': clean_persian_text(item.get('lSecVal', '')),
-                            'ISIN': item.get('cIsin', '')
-                        }
-                        results.append(result)
-            
-            return pd.DataFrame(results)
-            
-        except Exception as e:
-            self.logger.debug(f"Failed to parse new search response: {str(e)}")
-            return pd.DataFrame()
+        if not isinstance(data, list):
+            return []
+        
+        return [
+            [
+                item.get('lVal30', ''),
+                item.get('lVal18AFC', ''),
+                str(item.get('insCode', '')),
+                _MARKET_BY_FLOW.get(item.get('flow', 0), 'نامعلوم'),
+                item.get('lSecVal', ''),
+                item.get('cIsin', '')
+            ]
+            for item in data if isinstance(item, dict)
+        ]
     
     def _fallback_search(self, query: str) -> pd.DataFrame:
         """
@@ -492,41 +742,65 @@ class StockService(BaseService):
             DataFrame with search results
         """
         try:
-            # Comprehensive stock mapping for common Iranian stocks
-            stock_mapping = {
-                'پترول': {'Name': 'شرکت ملی صنایع پتروشیمی', 'Symbol': 'پترول', 'WebID': '46348559193224090', 'Market': 'بورس', 'Sector': 'پتروشیمی', 'ISIN': 'IRO1MSMI0001'},
-                'خودرو': {'Name': 'ایران خودرو', 'Symbol': 'خودرو', 'WebID': '65883838195688438', 'Market': 'بورس', 'Sector': 'خودرو', 'ISIN': 'IRO1IKCO0001'},
-                'فولاد': {'Name': 'فولاد مبارکه اصفهان', 'Symbol': 'فولاد', 'WebID': '35700344742835695', 'Market': 'بورس', 'Sector': 'فولاد', 'ISIN': 'IRO1MSMI0001'},
-                'بانک': {'Name': 'بانک ملت', 'Symbol': 'بانک', 'WebID': '778253364357513', 'Market': 'بورس', 'Sector': 'بانک', 'ISIN': 'IRO1BMLT0001'},
-                'وخارزم': {'Name': 'خارزمی', 'Symbol': 'وخارزم', 'WebID': '778253364357514', 'Market': 'بورس', 'Sector': 'فناوری', 'ISIN': 'IRO1KHRZ0001'},
-                'ذوب': {'Name': 'ذوب آهن اصفهان', 'Symbol': 'ذوب', 'WebID': '778253364357515', 'Market': 'بورس', 'Sector': 'فولاد', 'ISIN': 'IRO1ZOBS0001'}
-            }
-            
-            # Normalize query for better matching
-            query_normalized = query.lower().strip()
-            
-            results = []
-            for key, value in stock_mapping.items():
-                # Check for exact match or partial match
-                if (query_normalized in key.lower() or 
-                    key.lower() in query_normalized or
-                    query_normalized in value['Name'].lower() or
-                    query_normalized in value['Symbol'].lower()):
-                    results.append(value)
-            
+            results = self._fallback_records(query)
             return pd.DataFrame(results) if results else pd.DataFrame()
             
         except Exception as e:
             self.logger.error(f"Fallback search failed: {str(e)}")
             return pd.DataFrame()
     
-    def _determine_market(self, flow: int) -> str:
-        """Determine market name from flow code."""
-        market_mapping = {
-            1: 'بورس',
-            2: 'فرابورس', 
-            3: 'پایه زرد',
-            4: 'پایه نارنجی',
-            5: 'پایه قرمز'
-        }
-        return market_mapping.get(flow, 'نامعلوم') 
\ No newline at end of file
+    def _fallback_records(self, query: str) -> List[Dict[str, str]]:
+        """Match a clean query against the known stock mappings."""
+        # Normalize query for better matching
+        query_normalized = query.lower().strip()
+        
+        # Exact ticker hit needs no scan at all
+        exact = _FALLBACK_BY_KEY.get(query_normalized)
+        if exact is not None:
+            return [dict(exact)]
+        
+        # Records whose key, name or symbol contains the query: one
+        # str.find per matching record over the joined haystack
+        matches = set()
+        pos = _FALLBACK_HAYSTACK.find(query_normalized)
+        while pos != -1:
+            idx = bisect_right(_FALLBACK_STARTS, pos) - 1
+            matches.add(idx)
+            if idx + 1 >= len(_FALLBACK_STARTS):
+                break
+            pos = _FALLBACK_HAYSTACK.find(query_normalized, _FALLBACK_STARTS[idx + 1])
+        
+        # Records whose key is contained in the query
+        if _FALLBACK_KEY_AUTOMATON is not None:
+            for _, idxs in _FALLBACK_KEY_AUTOMATON.iter(query_normalized):
+                matches.update(idxs)
+        else:
+            matches.update(
+                idx for idx, key in enumerate(_FALLBACK_KEYS) if key in query_normalized
+            )
+        
+        return [dict(_FALLBACK_RECORDS[idx]) for idx in sorted(matches)]
+    
+    def _clean_text_columns(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """Normalize Persian text in the given columns, one column at a time."""
+        for col in columns:
+            df[col] = clean_persian_series(df[col].astype(object))
+        return df
+    
+    def _record_new_api_result(self, success: bool) -> None:
+        """Update the new search endpoint's circuit breaker state."""
+        with StockService._new_api_lock:
+            if success:
+                StockService._new_api_failures = 0
+                StockService._new_api_skip_until = 0.0
+                return
+            
+            StockService._new_api_failures += 1
+            tripped = StockService._new_api_failures >= self._NEW_API_FAILURE_THRESHOLD
+            if tripped:
+                StockService._new_api_skip_until = time.monotonic() + self._NEW_API_COOLDOWN
+        
+        if tripped:
+            self.logger.debug(
+                f"New API endpoint disabled for {self._NEW_API_COOLDOWN:.0f} seconds"
+            )
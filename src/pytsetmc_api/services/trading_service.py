@@ -2,24 +2,161 @@
 Trading service for retrieving intraday trades, order book, and queue history.
 """
 
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Callable
 import jdatetime
 import asyncio
 import aiohttp
+import os
 import platform
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from .base_service import BaseService
 from .stock_service import StockService
+from ..cache import FileCache
 from ..exceptions import TSETMCError, TSETMCAPIError, TSETMCDataError
 from ..models import IntradayTrade, OrderBookData
 from ..utils import (
     validate_jalali_date, convert_jalali_to_gregorian, 
-    safe_int_conversion, safe_float_conversion
+    safe_int_conversion, safe_float_conversion, create_http_headers, parse_json,
+    normalize_stock_symbol
 )
 
+# Zero-padded two digit strings, indexed by value, for building HH:MM:SS times
+_TWO_DIGITS = np.array([f"{i:02d}" for i in range(100)], dtype=object)
+
+
+@lru_cache(maxsize=4096)
+def _parse_g_date(j_date: str) -> str:
+    """Convert a Jalali YYYY-MM-DD day to the YYYYMMDD Gregorian form used in API URLs."""
+    return convert_jalali_to_gregorian(j_date).strftime('%Y%m%d')
+
+
+def _run_on_new_loop(coro):
+    """asyncio.run, but on a selector loop on Windows."""
+    if not sys.platform.startswith('win'):
+        return asyncio.run(coro)
+    # The default proactor loop is unreliable with aiohttp on Windows. The
+    # selector loop is created directly rather than through the event loop
+    # policy, which is process-wide and belongs to the application
+    loop = asyncio.SelectorEventLoop()
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coro)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+class _ParquetDayWriter:
+    """
+    Stream per-day frames into one Parquet file, one row group per day.
+
+    Days may finish in any order; each is buffered only until every earlier
+    day has been written, so rows stay in day order while memory holds just
+    the days that are ahead of the slowest pending one. A day whose columns
+    don't fit the file's schema (e.g. floats after integer days) widens it,
+    rewriting the days already written. Requires pyarrow.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer = None
+        self._pending: Dict[int, pd.DataFrame] = {}
+        self._next_index = 0
+
+    def add(self, index: int, df: pd.DataFrame) -> None:
+        """Accept the frame of the day at ``index``, writing whatever is now in order."""
+        self._pending[index] = df
+        while self._next_index in self._pending:
+            frame = self._pending.pop(self._next_index)
+            self._next_index += 1
+            if not frame.empty:
+                self._write(frame)
+
+    def _write(self, frame: pd.DataFrame) -> None:
+        """Append a frame as a new row group."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression='zstd')
+        elif not table.schema.equals(self._writer.schema):
+            schema = self._writer.schema
+            if not set(table.column_names) <= set(schema.names):
+                schema = self._widen(table.schema)
+            try:
+                table = self._conform(table, schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                table = self._conform(table, self._widen(table.schema))
+        self._writer.write_table(table)
+
+    def _widen(self, schema):
+        """Rewrite the written row groups under a schema that also fits ``schema``."""
+        import pyarrow.parquet as pq
+
+        merged = self._merge_schemas(self._writer.schema, schema)
+        self._writer.close()
+        old_path = f"{self.path}.old"
+        os.replace(self.path, old_path)
+        self._writer = pq.ParquetWriter(self.path, merged, compression='zstd')
+        with pq.ParquetFile(old_path) as written:
+            for i in range(written.num_row_groups):
+                self._writer.write_table(self._conform(written.read_row_group(i), merged))
+        os.remove(old_path)
+        return merged
+
+    @staticmethod
+    def _merge_schemas(old, new):
+        """Union of two schemas, promoting differing types and falling back to strings."""
+        import pyarrow as pa
+
+        fields = {}
+        for field in list(old) + list(new):
+            known = fields.get(field.name)
+            if known is None or known.type == field.type:
+                fields[field.name] = known or field
+                continue
+            try:
+                fields[field.name] = pa.unify_schemas(
+                    [pa.schema([known]), pa.schema([field])], promote_options='permissive'
+                ).field(0)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                fields[field.name] = pa.field(field.name, pa.string())
+        return pa.schema(list(fields.values()))
+
+    @staticmethod
+    def _conform(table, schema):
+        """Cast ``table`` to ``schema``, filling columns it lacks with nulls."""
+        import pyarrow as pa
+
+        columns = [
+            table.column(field.name).cast(field.type)
+            if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ]
+        return pa.Table.from_arrays(columns, schema=schema)
+
+    def close(self) -> None:
+        """Finish the file."""
+        if self._writer is not None:
+            self._writer.close()
+
+    def read(self) -> pd.DataFrame:
+        """Read the written days back memory-mapped, or an empty frame if none had data."""
+        if self._writer is None:
+            return pd.DataFrame()
+        import pyarrow.parquet as pq
+        return pq.read_table(self.path, memory_map=True).to_pandas()
+
 
 class TradingService(BaseService):
     """
@@ -29,10 +166,28 @@ class TradingService(BaseService):
     - Get historical intraday trades
     - Get historical order book data
     - Get queue history at market close
+
+    The history methods are synchronous even though days are fetched
+    concurrently. Called from a running event loop (Jupyter, async code)
+    they block that loop until they return; async callers that need the
+    loop to keep running should use ``await asyncio.to_thread(...)``.
     """
-    def __init__(self, **kwargs):
+    def __init__(self, max_concurrency: int = 16, cache_dir: Optional[str] = None, **kwargs):
+        """
+        Initialize the trading service.
+
+        Args:
+            max_concurrency: Maximum number of trading days fetched at once
+            cache_dir: Directory for caching closed trading days on disk, disabled if None
+            **kwargs: Arguments passed on to BaseService
+        """
         super().__init__(**kwargs)
+        self.max_concurrency = max_concurrency
+        self.cache = FileCache(cache_dir) if cache_dir else None
         self.stock_service = StockService(**kwargs)
+        # Web IDs rarely change, so lookups are kept for the service's lifetime
+        # and, with a cache directory, across runs until the cache TTL expires
+        self._web_ids: Dict[str, str] = self.cache.get_mapping('web_ids') if self.cache else {}
 
     def get_intraday_trades(
         self,
@@ -75,7 +230,8 @@ class TradingService(BaseService):
         stock: str,
         start_date: str,
         end_date: str,
-        show_progress: bool = True
+        show_progress: bool = True,
+        output_parquet: Optional[str] = None
     ) -> pd.DataFrame:
         """
         Get historical intraday trades for a stock between two dates.
@@ -85,45 +241,31 @@ class TradingService(BaseService):
             start_date: Start date in Jalali format (YYYY-MM-DD).
             end_date: End date in Jalali format (YYYY-MM-DD).
             show_progress: If True, displays a progress bar.
+            output_parquet: If given, each day is written to this Parquet file
+                (requires pyarrow) as soon as it arrives and the result is read
+                back from it, so fetched days are not all held in memory.
 
         Returns:
             DataFrame with intraday trade data.
         """
         self._validate_stock_name(stock)
         self._validate_date_range(start_date, end_date)
+        if output_parquet:
+            self._require_pyarrow()
         
         self.logger.info(f"Getting intraday trades for {stock} from {start_date} to {end_date}")
         
         try:
-            web_id = self.stock_service.get_web_id(stock)
+            web_id = self._get_web_id(stock)
             trading_days = self._get_trading_days(web_id, start_date, end_date)
             
             if not trading_days:
                 raise TSETMCDataError(f"No trading days found for {stock} in the specified period.")
 
-            # Use synchronous approach for better reliability on Windows
-            results = []
-            max_days = min(len(trading_days), 5)  # Limit to 5 days for demo
-            
-            if show_progress:
-                self.logger.info(f"Fetching intraday trades for {max_days} days...")
-            
-            for i, day in enumerate(trading_days[:max_days]):
-                try:
-                    if show_progress:
-                        self.logger.info(f"Processing day {i+1}/{max_days}: {day}")
-                    
-                    result = self._fetch_day_trades_sync(web_id, day)
-                    if not result.empty:
-                        results.append(result)
-                except Exception as e:
-                    self.logger.warning(f"Could not fetch trades for {day}: {e}")
-                    continue
-            
-            if results:
-                df = pd.concat(results, ignore_index=True)
-            else:
-                df = pd.DataFrame()
+            df = self._fetch_history(
+                self._fetch_day_trades, 'trades', web_id, trading_days,
+                show_progress, "Fetching Trades", output_parquet
+            )
             
             if df.empty:
                 raise TSETMCDataError("No intraday trade data found.")
@@ -136,50 +278,13 @@ class TradingService(BaseService):
             self.logger.error(f"Failed to get intraday trades history for {stock}: {e}")
             raise TSETMCAPIError(f"Could not retrieve intraday trades for {stock}.")
     
-    def _fetch_day_trades_sync(self, web_id: str, j_date: str) -> pd.DataFrame:
-        """Synchronous fallback for fetching intraday trades."""
-        try:
-            g_date = jdatetime.datetime.strptime(j_date, '%Y-%m-%d').togregorian().strftime('%Y%m%d')
-            url = f"http://cdn.tsetmc.com/api/Trade/GetTradeHistory/{web_id}/{g_date}/false"
-            
-            response = self._make_request(url)
-            data = response.json()
-            
-            if 'tradeHistory' not in data or not data['tradeHistory']:
-                return pd.DataFrame()
-                
-            df = pd.DataFrame(data['tradeHistory'])
-            
-            if df.empty or len(df.columns) < 6:
-                return pd.DataFrame()
-            
-            # Take the expected columns (adjust based on actual API response)
-            df = df.iloc[:, 2:6]
-            df.columns = ['Time', 'Volume', 'Price', 'nTran']
-            df = df.sort_values(by='nTran').drop(columns=['nTran'])
-            
-            # Format time properly
-            df['Time'] = df['Time'].astype(str).str.pad(6, 'left', '0').apply(
-                lambda x: f"{x[:2]}:{x[2:4]}:{x[4:]}" if len(x) >= 6 else x
-            )
-            df['J-Date'] = j_date
-            
-            # Ensure numeric columns
-            df['Volume'] = pd.to_numeric(df['Volume'], errors='coerce')
-            df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
-            
-            return df[['J-Date', 'Time', 'Volume', 'Price']].dropna()
-            
-        except Exception as e:
-            self.logger.warning(f"Sync fetch failed for {web_id} on {j_date}: {e}")
-            return pd.DataFrame()
-
     def get_intraday_ob_history(
         self,
         stock: str,
         start_date: str,
         end_date: str,
-        show_progress: bool = True
+        show_progress: bool = True,
+        output_parquet: Optional[str] = None
     ) -> pd.DataFrame:
         """
         Get historical intraday order book data for a stock between two dates.
@@ -189,26 +294,31 @@ class TradingService(BaseService):
             start_date: Start date in Jalali format (YYYY-MM-DD).
             end_date: End date in Jalali format (YYYY-MM-DD).
             show_progress: If True, displays a progress bar.
+            output_parquet: If given, each day is written to this Parquet file
+                (requires pyarrow) as soon as it arrives and the result is read
+                back from it, so fetched days are not all held in memory.
 
         Returns:
             DataFrame with intraday order book data.
         """
         self._validate_stock_name(stock)
         self._validate_date_range(start_date, end_date)
+        if output_parquet:
+            self._require_pyarrow()
 
         self.logger.info(f"Getting intraday order book for {stock} from {start_date} to {end_date}")
 
         try:
-            web_id = self.stock_service.get_web_id(stock)
+            web_id = self._get_web_id(stock)
             trading_days = self._get_trading_days(web_id, start_date, end_date)
 
             if not trading_days:
                 raise TSETMCDataError(f"No trading days found for {stock} in the specified period.")
             
-            tasks = [self._fetch_day_ob(web_id, day) for day in trading_days]
-            results = asyncio.run(self._run_tasks_with_progress(tasks, show_progress, "Fetching Order Book Data"))
-
-            df = pd.concat(results, ignore_index=True)
+            df = self._fetch_history(
+                self._fetch_day_ob, 'orderbook', web_id, trading_days,
+                show_progress, "Fetching Order Book Data", output_parquet
+            )
 
             if df.empty:
                 raise TSETMCDataError("No intraday order book data found.")
@@ -221,21 +331,179 @@ class TradingService(BaseService):
             self.logger.error(f"Failed to get intraday order book history for {stock}: {e}")
             raise TSETMCAPIError(f"Could not retrieve intraday order book data for {stock}.")
 
+    def clear_web_id_cache(self) -> None:
+        """Forget all remembered web IDs, including those saved on disk."""
+        self._web_ids.clear()
+        if self.cache is not None:
+            self.cache.delete_mapping('web_ids')
+
+    def _get_web_id(self, stock: str) -> str:
+        """Get a stock's web ID, looking it up only the first time it is seen."""
+        key = normalize_stock_symbol(stock)
+        web_id = self._web_ids.get(key)
+        if web_id is not None:
+            return web_id
+
+        web_id = self.stock_service.get_web_id(stock)
+        # Only remember IDs from a live search, not the offline fallbacks
+        # returned when the search endpoints failed
+        if web_id and self.stock_service.is_verified_web_id(web_id):
+            self._web_ids[key] = web_id
+            if self.cache is not None:
+                try:
+                    self.cache.set_mapping('web_ids', self._web_ids)
+                except OSError as e:
+                    self.logger.warning(f"Could not save web ID cache: {e}")
+        return web_id
+
     def _get_trading_days(self, web_id: str, start_date: str, end_date: str) -> List[str]:
         """Get the list of trading days for a stock in a given period."""
         url = f"http://old.tsetmc.com/tsev2/data/InstTradeHistory.aspx?i={web_id}&Top=999999&A=0"
         response = self._make_request(url)
         
-        days = []
-        for item in response.text.split(';'):
-            if not item: continue
-            date_str = item.split('@')[0]
-            greg_date = datetime.strptime(date_str, '%Y%m%d').date()
-            jalali_date = str(jdatetime.date.fromgregorian(date=greg_date))
-            
-            if start_date <= jalali_date <= end_date:
-                days.append(jalali_date)
-        return days
+        # Filter on the YYYYMMDD strings (which sort like dates) so only days
+        # in range need a Jalali conversion
+        g_start = convert_jalali_to_gregorian(start_date).strftime('%Y%m%d')
+        g_end = convert_jalali_to_gregorian(end_date).strftime('%Y%m%d')
+        dates = np.array([item.split('@', 1)[0] for item in response.text.split(';') if item])
+        if dates.size == 0:
+            return []
+
+        in_range = pd.to_datetime(dates[(dates >= g_start) & (dates <= g_end)], format='%Y%m%d')
+        return [str(jdatetime.date.fromgregorian(date=day)) for day in in_range.date]
+
+    @staticmethod
+    def _concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatenate per-day frames column by column.
+
+        Every day has the same columns, so joining the NumPy arrays directly
+        avoids pd.concat's per-frame index and block handling.
+        """
+        columns = frames[0].columns
+        if any(not frame.columns.equals(columns) for frame in frames[1:]):
+            return pd.concat(frames, ignore_index=True)
+        data = {
+            column: np.concatenate([frame[column].to_numpy(copy=False) for frame in frames])
+            for column in columns
+        }
+        return pd.DataFrame(data, copy=False)
+
+    @staticmethod
+    def _require_pyarrow() -> None:
+        """Fail early if Parquet output was requested without pyarrow."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required for output_parquet. "
+                "Install it with: pip install pytsetmc-api[parquet]"
+            )
+
+    def _fetch_history(
+        self,
+        fetch_day,
+        endpoint: str,
+        web_id: str,
+        trading_days: List[str],
+        show_progress: bool,
+        description: str,
+        output_parquet: Optional[str]
+    ) -> pd.DataFrame:
+        """Fetch every trading day and combine them in day order."""
+        if output_parquet:
+            writer = _ParquetDayWriter(output_parquet)
+            try:
+                self._run_async(self._fetch_days(
+                    fetch_day, endpoint, web_id, trading_days, show_progress, description,
+                    on_day=writer.add
+                ))
+            finally:
+                writer.close()
+            return writer.read()
+
+        results = self._run_async(self._fetch_days(
+            fetch_day, endpoint, web_id, trading_days, show_progress, description
+        ))
+        results = [result for result in results if not result.empty]
+        return self._concat_frames(results) if results else pd.DataFrame()
+
+    def _run_async(self, coro):
+        """
+        Run a coroutine to completion on a fresh event loop.
+
+        asyncio.run refuses to start inside a running loop, as in Jupyter or
+        an async caller, so there the coroutine runs on a worker thread with
+        its own loop while the caller waits. That wait blocks the caller's
+        thread and with it the running loop until every day is fetched.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return _run_on_new_loop(coro)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(_run_on_new_loop, coro).result()
+
+    async def _fetch_days(
+        self,
+        fetch_day,
+        endpoint: str,
+        web_id: str,
+        trading_days: List[str],
+        show_progress: bool,
+        description: str,
+        on_day: Optional[Callable[[int, pd.DataFrame], None]] = None
+    ) -> List[Optional[pd.DataFrame]]:
+        """
+        Fetch all trading days concurrently, at most max_concurrency at a time.
+
+        All days share one session so connections and DNS lookups are reused.
+        Closed days are served from and saved to the file cache when enabled;
+        today's partial data is never cached.
+
+        If ``on_day`` is given, it is called with each day's position and
+        frame as soon as the day completes, and None is returned in its
+        place so finished days are not kept.
+        """
+        today = str(jdatetime.date.today())
+        # Convert every day up front so the fetchers (two URLs per day for
+        # the order book) share one conversion
+        day_pairs = [(day, _parse_g_date(day)) for day in trading_days]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(
+            limit=256, limit_per_host=64, ttl_dns_cache=300, keepalive_timeout=30
+        )
+
+        async with aiohttp.ClientSession(headers=create_http_headers(), connector=connector) as session:
+            async def fetch_cached(day: str, g_date: str) -> pd.DataFrame:
+                cacheable = self.cache is not None and day < today
+                if cacheable:
+                    cached = self.cache.get(endpoint, web_id, day)
+                    if cached is not None:
+                        return cached
+
+                async with semaphore:
+                    df = await fetch_day(session, web_id, day, g_date)
+
+                if cacheable and not df.empty:
+                    try:
+                        self.cache.set(endpoint, web_id, day, df)
+                    except OSError as e:
+                        self.logger.warning(f"Could not cache {endpoint} for {web_id} on {day}: {e}")
+                return df
+
+            async def fetch_bounded(index: int, day: str, g_date: str) -> Optional[pd.DataFrame]:
+                df = await fetch_cached(day, g_date)
+                if on_day is None:
+                    return df
+                on_day(index, df)
+                return None
+
+            tasks = [
+                fetch_bounded(index, day, g_date)
+                for index, (day, g_date) in enumerate(day_pairs)
+            ]
+            return await self._run_tasks_with_progress(tasks, show_progress, description)
 
     async def _run_tasks_with_progress(self, tasks: List, show_progress: bool, description: str):
         """Run asyncio tasks, optionally with a progress bar."""
@@ -250,65 +518,95 @@ class TradingService(BaseService):
         else:
             return await asyncio.gather(*tasks)
 
-    async def _get_async_session(self):
-        """Create and return an aiohttp session."""
-        from ..utils import create_http_headers
-        headers = create_http_headers()
-        return aiohttp.ClientSession(headers=headers)
-    
-    async def _fetch_day_trades(self, web_id: str, j_date: str) -> pd.DataFrame:
+    async def _fetch_day_trades(
+        self, session: aiohttp.ClientSession, web_id: str, j_date: str, g_date: str
+    ) -> pd.DataFrame:
         """Fetch intraday trades for a single day."""
-        g_date = jdatetime.datetime.strptime(j_date, '%Y-%m-%d').togregorian().strftime('%Y%m%d')
         url = f"http://cdn.tsetmc.com/api/Trade/GetTradeHistory/{web_id}/{g_date}/false"
         
         try:
-            async with await self._get_async_session() as session:
-                response = await self._make_async_request(session, url)
-                data = await response.json()
-                df = pd.DataFrame(data['tradeHistory'])
-                if df.empty: 
-                    return df
-                
-                df = df.iloc[:, 2:6]
-                df.columns = ['Time', 'Volume', 'Price', 'nTran']
-                df = df.sort_values(by='nTran').drop(columns=['nTran'])
-                df['Time'] = df['Time'].astype(str).str.pad(6, 'left', '0').apply(lambda x: f"{x[:2]}:{x[2:4]}:{x[4:]}")
-                df['J-Date'] = j_date
-                return df[['J-Date', 'Time', 'Volume', 'Price']]
+            response = await self._make_async_request(session, url)
+            data = parse_json(await response.read())
+            return self._trades_frame(data['tradeHistory'], j_date)
         except Exception as e:
             self.logger.warning(f"Could not fetch trades for {web_id} on {j_date}: {e}")
             return pd.DataFrame()
 
-    async def _fetch_day_ob(self, web_id: str, j_date: str) -> pd.DataFrame:
+    @staticmethod
+    def _format_times(values) -> np.ndarray:
+        """Format integer HHMMSS times (e.g. 90501) as 'HH:MM:SS' strings."""
+        hours, rest = np.divmod(np.asarray(values, dtype=np.int64), 10000)
+        minutes, seconds = np.divmod(rest, 100)
+        return _TWO_DIGITS[hours] + ':' + _TWO_DIGITS[minutes] + ':' + _TWO_DIGITS[seconds]
+
+    @classmethod
+    def _trades_frame(cls, rows: List[Dict[str, Any]], j_date: str) -> pd.DataFrame:
+        """
+        Build a day's trades frame straight from the tradeHistory records.
+
+        The records are unpacked into column arrays in one pass rather than
+        materializing a frame of every field first.
+        """
+        if not rows:
+            return pd.DataFrame()
+
+        n_tran, times, volumes, prices = zip(*(
+            (row['nTran'], row['hEven'], row['qTitTran'], row['pTran']) for row in rows
+        ))
+        order = np.argsort(np.asarray(n_tran), kind='stable')
+
+        df = pd.DataFrame({
+            'Time': cls._format_times(np.asarray(times)[order]),
+            'Volume': np.asarray(volumes)[order],
+            'Price': np.asarray(prices)[order],
+        }, copy=False)
+        df.insert(0, 'J-Date', j_date)
+        return df
+
+    async def _fetch_day_ob(
+        self, session: aiohttp.ClientSession, web_id: str, j_date: str, g_date: str
+    ) -> pd.DataFrame:
         """Fetch order book data for a single day."""
-        g_date = jdatetime.datetime.strptime(j_date, '%Y-%m-%d').togregorian().strftime('%Y%m%d')
-        
         try:
-            async with await self._get_async_session() as session:
-                # Get day's static thresholds (price limits)
-                threshold_url = f"http://cdn.tsetmc.com/api/MarketData/GetStaticThreshold/{web_id}/{g_date}"
-                threshold_res = await self._make_async_request(session, threshold_url)
-                threshold_data = await threshold_res.json()
-                day_ul = threshold_data['staticThreshold'][-1]['psGelStaMax']
-                day_ll = threshold_data['staticThreshold'][-1]['psGelStaMin']
-
-                # Get order book history
-                ob_url = f"http://cdn.tsetmc.com/api/BestLimits/{web_id}/{g_date}"
-                ob_res = await self._make_async_request(session, ob_url)
-                ob_data = await ob_res.json()
-                df = pd.DataFrame(ob_data['bestLimitsHistory'])
-                if df.empty: 
-                    return df
+            # Get day's static thresholds (price limits)
+            threshold_url = f"http://cdn.tsetmc.com/api/MarketData/GetStaticThreshold/{web_id}/{g_date}"
+            threshold_res = await self._make_async_request(session, threshold_url)
+            threshold_data = parse_json(await threshold_res.read())
+            day_ul = threshold_data['staticThreshold'][-1]['psGelStaMax']
+            day_ll = threshold_data['staticThreshold'][-1]['psGelStaMin']
 
-                df = df[(df['hEven'] >= 84500) & (df['hEven'] < 123000)]
-                df = df.sort_values(['hEven', 'number'])
-                df.columns = ['Time', 'Depth', 'Buy_Vol', 'Buy_No', 'Buy_Price', 'Sell_Price', 'Sell_No', 'Sell_Vol', 'idn', 'dEven', 'refID', 'insCode']
-                df['Time'] = df['Time'].astype(str).str.pad(6, 'left', '0').apply(lambda x: f"{x[:2]}:{x[2:4]}:{x[4:]}")
-                df['J-Date'] = j_date
-                df['Day_UL'] = day_ul
-                df['Day_LL'] = day_ll
-                
-                return df[['J-Date', 'Time', 'Depth', 'Sell_No', 'Sell_Vol', 'Sell_Price', 'Buy_Price', 'Buy_Vol', 'Buy_No', 'Day_LL', 'Day_UL']]
+            # Get order book history
+            ob_url = f"http://cdn.tsetmc.com/api/BestLimits/{web_id}/{g_date}"
+            ob_res = await self._make_async_request(session, ob_url)
+            ob_data = parse_json(await ob_res.read())
+
+            # Keep the trading session only, then unpack straight into columns
+            rows = [row for row in ob_data['bestLimitsHistory'] if 84500 <= row['hEven'] < 123000]
+            if not rows:
+                return pd.DataFrame()
+
+            times, depth, buy_no, buy_vol, buy_price, sell_price, sell_vol, sell_no = (
+                np.asarray(column) for column in zip(*(
+                    (row['hEven'], row['number'], row['zOrdMeDem'], row['qTitMeDem'],
+                     row['pMeDem'], row['pMeOf'], row['qTitMeOf'], row['zOrdMeOf'])
+                    for row in rows
+                ))
+            )
+            order = np.lexsort((depth, times))
+
+            return pd.DataFrame({
+                'J-Date': j_date,
+                'Time': self._format_times(times[order]),
+                'Depth': depth[order],
+                'Sell_No': sell_no[order],
+                'Sell_Vol': sell_vol[order],
+                'Sell_Price': sell_price[order],
+                'Buy_Price': buy_price[order],
+                'Buy_Vol': buy_vol[order],
+                'Buy_No': buy_no[order],
+                'Day_LL': day_ll,
+                'Day_UL': day_ul,
+            }, copy=False)
 
         except Exception as e:
             self.logger.warning(f"Could not fetch order book for {web_id} on {j_date}: {e}")
@@ -6,21 +6,46 @@ text processing, and other common operations used throughout the package.
 """
 
 import re
+import json
+import time
+import asyncio
 import logging
 from datetime import date, datetime
-from typing import Optional, Dict, Any, Union
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Dict, Any, Union, Iterable, Iterator
 
 import jdatetime
-from persiantools import characters
+import pandas as pd
 from rich.console import Console
 from rich.logging import RichHandler
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependency, kept for partial installs
+    orjson = None
+
 from .exceptions import TSETMCValidationError
 
 
 # Setup rich console for better output formatting
 console = Console()
 
+# Arabic to Persian character normalization; zero-width non-joiners
+# are turned into spaces in the same pass
+_PERSIAN_TRANS = str.maketrans({
+    '\u064a': '\u06cc',  # Arabic yeh -> Persian yeh
+    '\u0649': '\u06cc',  # Alef maksura -> Persian yeh
+    '\u0643': '\u06a9',  # Arabic kaf -> Persian kaf
+    '\u200c': ' ',
+})
+# Kasra after these letters is dropped, matching persiantools' ar_to_fa
+_KASRA_RE = re.compile('([\u062f\u0628\u0632\u0630\u0634\u0633])\u0650')
+# Date separators accepted in place of hyphens
+_SEP_RE = re.compile(r'[/.]')
+# Latin to Persian digits
+_FA_DIGITS = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
+
 
 def setup_logging(
     level: str = "INFO",
@@ -70,40 +95,46 @@ def setup_logging(
     return logging.getLogger(__name__)
 
 
-def validate_jalali_date(date_string: str, field_name: str = "date") -> str:
-    """Validate and normalize a Jalali (Persian) date string.
+def _parse_jalali(date_string: str, field_name: str = "date") -> tuple[str, jdatetime.date]:
+    """Parse a Jalali date string once for both validation and conversion.
     
     Args:
         date_string: Date string in YYYY-MM-DD format.
         field_name: Name of the field being validated (for error messages).
         
     Returns:
-        Normalized date string in YYYY-MM-DD format.
+        Tuple of the normalized YYYY-MM-DD string and the Jalali date.
         
     Raises:
         TSETMCValidationError: If the date format is invalid.
-        
-    Example:
-        >>> validate_jalali_date("1404-01-01")
-        '1404-01-01'
-        >>> validate_jalali_date("1403/1/1")
-        '1404-01-01'
     """
+    # Checked before the cached parser, which can't hash lists or dicts
     if not date_string or not isinstance(date_string, str):
         raise TSETMCValidationError(
             f"Invalid {field_name}: date string cannot be empty",
             field_name=field_name,
             field_value=date_string,
         )
-    
-    # Clean the date string
-    date_string = date_string.strip()
-    
-    # Replace common separators with hyphens
-    date_string = re.sub(r'[/.]', '-', date_string)
-    
-    # Split the date parts
-    parts = date_string.split('-')
+    return _parse_jalali_string(date_string, field_name)
+
+
+@lru_cache(maxsize=4096)
+def _parse_jalali_string(date_string: str, field_name: str) -> tuple[str, jdatetime.date]:
+    """Cached body of :func:`_parse_jalali` for non-empty strings."""
+    if (len(date_string) == 10 and date_string[4] == '-' and date_string[7] == '-'
+            and date_string.isascii() and date_string[:4].isdigit()
+            and date_string[5:7].isdigit() and date_string[8:].isdigit()):
+        # Already YYYY-MM-DD, as produced internally; skip the cleanup below
+        parts = [date_string[:4], date_string[5:7], date_string[8:]]
+    else:
+        # Clean the date string
+        date_string = date_string.strip()
+        
+        # Replace common separators with hyphens
+        date_string = _SEP_RE.sub('-', date_string)
+        
+        # Split the date parts
+        parts = date_string.split('-')
     
     if len(parts) != 3:
         raise TSETMCValidationError(
@@ -127,7 +158,8 @@ def validate_jalali_date(date_string: str, field_name: str = "date") -> str:
         jalali_date = jdatetime.date(year=year, month=month, day=day)
         
         # Return normalized format
-        return f'{jalali_date.year:04d}-{jalali_date.month:02d}-{jalali_date.day:02d}'
+        normalized = f'{jalali_date.year:04d}-{jalali_date.month:02d}-{jalali_date.day:02d}'
+        return normalized, jalali_date
         
     except ValueError as e:
         raise TSETMCValidationError(
@@ -137,6 +169,28 @@ def validate_jalali_date(date_string: str, field_name: str = "date") -> str:
         ) from e
 
 
+def validate_jalali_date(date_string: str, field_name: str = "date") -> str:
+    """Validate and normalize a Jalali (Persian) date string.
+    
+    Args:
+        date_string: Date string in YYYY-MM-DD format.
+        field_name: Name of the field being validated (for error messages).
+        
+    Returns:
+        Normalized date string in YYYY-MM-DD format.
+        
+    Raises:
+        TSETMCValidationError: If the date format is invalid.
+        
+    Example:
+        >>> validate_jalali_date("1404-01-01")
+        '1404-01-01'
+        >>> validate_jalali_date("1403/1/1")
+        '1404-01-01'
+    """
+    return _parse_jalali(date_string, field_name)[0]
+
+
 def convert_jalali_to_gregorian(jalali_date_string: str) -> date:
     """Convert a Jalali date string to a Gregorian date object.
     
@@ -153,26 +207,20 @@ def convert_jalali_to_gregorian(jalali_date_string: str) -> date:
         >>> convert_jalali_to_gregorian("1404-01-01")
         datetime.date(2021, 3, 21)
     """
-    # Validate the Jalali date first
-    normalized_date = validate_jalali_date(jalali_date_string)
-    
-    # Parse the normalized date
-    year, month, day = map(int, normalized_date.split('-'))
-    
+    return _jalali_to_gregorian(_parse_jalali(jalali_date_string)[1])
+
+
+@lru_cache(maxsize=4096)
+def _jalali_to_gregorian(jalali_date: jdatetime.date) -> date:
+    """Cached Gregorian conversion of an already validated Jalali date."""
     try:
-        # Create Jalali date object
-        jalali_date = jdatetime.date(year=year, month=month, day=day)
-        
-        # Convert to Gregorian
-        gregorian_date = jalali_date.togregorian()
-        
-        return gregorian_date
+        return jalali_date.togregorian()
         
     except Exception as e:
         raise TSETMCValidationError(
             f"Failed to convert Jalali date to Gregorian: {str(e)}",
             field_name="jalali_date",
-            field_value=jalali_date_string,
+            field_value=str(jalali_date),
         ) from e
 
 
@@ -218,21 +266,50 @@ def clean_persian_text(text: str) -> str:
     if not text or not isinstance(text, str):
         return ""
     
-    # Convert Arabic characters to Persian
-    text = characters.ar_to_fa(text)
-    
-    # Remove zero-width non-joiner characters and replace with space
-    text = text.replace('\u200c', ' ')
+    # Convert Arabic characters to Persian and replace zero-width
+    # non-joiners with spaces in a single pass
+    text = text.translate(_PERSIAN_TRANS)
+    if '\u0650' in text:
+        text = _KASRA_RE.sub(r'\1', text)
     
     # Remove extra whitespace
     text = ' '.join(text.split())
     
-    # Strip leading and trailing whitespace
-    text = text.strip()
-    
     return text
 
 
+def clean_persian_series(series: pd.Series) -> pd.Series:
+    """Apply :func:`clean_persian_text` to every value of a Series.
+    
+    Uses pandas string methods so whole columns are cleaned without a
+    Python-level call per cell. Non-string values become empty strings.
+    
+    Args:
+        series: The Series of text values to clean.
+        
+    Returns:
+        Series of cleaned and normalized text.
+        
+    Example:
+        >>> clean_persian_series(pd.Series(["  بانك\u200c ملت "])).tolist()
+        ['بانک ملت']
+    """
+    try:
+        strings = series.str
+    except AttributeError:
+        # The .str accessor rejects columns without any strings, such as
+        # all-NaN or numeric ones
+        return series.map(clean_persian_text).astype(object)
+    
+    return (
+        strings.translate(_PERSIAN_TRANS)
+        .str.replace(_KASRA_RE, r'\1', regex=True)
+        .str.split()
+        .str.join(' ')
+        .fillna('')
+    )
+
+
 def normalize_stock_symbol(symbol: str) -> str:
     """Normalize a stock symbol for consistent matching.
     
@@ -286,13 +363,9 @@ def validate_date_range(start_date: str, end_date: str) -> tuple[str, str]:
         >>> validate_date_range("1404-01-01", "1404-12-29")
         ('1404-01-01', '1404-12-29')
     """
-    # Validate both dates
-    start_normalized = validate_jalali_date(start_date, "start_date")
-    end_normalized = validate_jalali_date(end_date, "end_date")
-    
-    # Convert to date objects for comparison
-    start_date_obj = convert_jalali_to_gregorian(start_normalized)
-    end_date_obj = convert_jalali_to_gregorian(end_normalized)
+    # Parse each date once; Jalali dates compare like their Gregorian equivalents
+    start_normalized, start_date_obj = _parse_jalali(start_date, "start_date")
+    end_normalized, end_date_obj = _parse_jalali(end_date, "end_date")
     
     if start_date_obj > end_date_obj:
         raise TSETMCValidationError(
@@ -328,15 +401,25 @@ def format_number(number: Union[int, float], locale: str = "fa") -> str:
     
     if locale == "fa":
         # Convert to Persian digits
-        persian_digits = "۰۱۲۳۴۵۶۷۸۹"
-        english_digits = "0123456789"
-        
-        for i, digit in enumerate(english_digits):
-            formatted = formatted.replace(digit, persian_digits[i])
+        formatted = formatted.translate(_FA_DIGITS)
     
     return formatted
 
 
+_DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/121.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "fa,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+}
+
+
 def create_http_headers(user_agent: Optional[str] = None) -> Dict[str, str]:
     """Create HTTP headers for API requests.
     
@@ -346,20 +429,32 @@ def create_http_headers(user_agent: Optional[str] = None) -> Dict[str, str]:
     Returns:
         Dictionary of HTTP headers.
     """
-    default_user_agent = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/121.0.0.0 Safari/537.36"
-    )
+    # Copy the prebuilt defaults so callers are free to modify the result
+    headers = dict(_DEFAULT_HEADERS)
+    if user_agent:
+        headers["User-Agent"] = user_agent
+    return headers
+
+
+def parse_json(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document, using orjson when it is installed.
     
-    return {
-        "User-Agent": user_agent or default_user_agent,
-        "Accept": "application/json, text/plain, */*",
-        "Accept-Language": "fa,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-    }
+    Args:
+        data: JSON text or raw UTF-8 bytes.
+        
+    Returns:
+        The decoded Python object.
+        
+    Raises:
+        ValueError: If the data is not valid JSON.
+        
+    Example:
+        >>> parse_json(b'{"insCode": "123"}')
+        {'insCode': '123'}
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def safe_float_conversion(value: Any) -> Optional[float]:
@@ -434,6 +529,30 @@ def chunk_list(data: list, chunk_size: int) -> list[list]:
     return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
 
 
+def chunk_iter(data: Iterable, chunk_size: int) -> Iterator[list]:
+    """Lazily split an iterable into chunks of specified size.
+    
+    Unlike chunk_list, only one chunk is held at a time and any iterable
+    (including generators) is accepted.
+    
+    Args:
+        data: The iterable to chunk.
+        chunk_size: Maximum size of each chunk.
+        
+    Returns:
+        Iterator over chunks.
+        
+    Example:
+        >>> list(chunk_iter(range(5), 2))
+        [[0, 1], [2, 3], [4]]
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive")
+    
+    it = iter(data)
+    return iter(lambda: list(islice(it, chunk_size)), [])
+
+
 def retry_on_failure(
     max_retries: int = 3,
     delay: float = 1.0,
@@ -491,6 +610,53 @@ def retry_on_failure(
     return decorator
 
 
+class AsyncRateLimiter:
+    """Token bucket limiting how often async requests may start.
+    
+    Allows bursts of up to max_rate requests, refilled at max_rate per
+    time_period seconds. The bucket is not tied to an event loop, so one
+    limiter can be shared across successive asyncio.run calls.
+    
+    Args:
+        max_rate: Number of requests allowed per time period.
+        time_period: Length of the time period in seconds.
+        
+    Example:
+        >>> limiter = AsyncRateLimiter(20, 1.0)
+        >>> async with limiter:
+        ...     pass
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        if max_rate <= 0 or time_period <= 0:
+            raise ValueError("max_rate and time_period must be positive")
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        refill_rate = self.max_rate / self.time_period
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.max_rate, self._tokens + (now - self._updated) * refill_rate)
+            self._updated = now
+            # No await between the check and the decrement, so this is safe
+            # without a lock on a single event loop
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / refill_rate)
+    
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
 if __name__ == "__main__": 
     # Example usage and testing
     logger = setup_logging(level="INFO")
@@ -0,0 +1,44 @@
+import pytest
+import pandas as pd
+from unittest.mock import patch
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_get_logger():
+    """Silence service loggers for the whole session with a single patch."""
+    patcher = patch('logging.getLogger')
+    mock = patcher.start()
+    yield mock
+    patcher.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _no_setup_logging():
+    """Keep TSETMCClient from configuring real logging handlers."""
+    with patch('pytsetmc_api.client.setup_logging') as mock:
+        yield mock
+
+
+@pytest.fixture(scope="session")
+def history_a():
+    """Adjusted close history for stock 'A'."""
+    df = pd.DataFrame({'Adj Close': [100, 101]}, index=['1404-01-01', '1404-01-02'])
+    df.columns.name = 'A'
+    return df
+
+
+@pytest.fixture(scope="session")
+def history_b():
+    """Adjusted close history for stock 'B'."""
+    df = pd.DataFrame({'Adj Close': [200, 202]}, index=['1404-01-01', '1404-01-02'])
+    df.columns.name = 'B'
+    return df
+
+
+@pytest.fixture(scope="session")
+def price_df():
+    """Close prices on a Thursday and a Friday, keyed by Jalali date."""
+    return pd.DataFrame({
+        'Date': ['1404-01-05', '1404-01-06'],
+        'Close': [100, 101]
+    })
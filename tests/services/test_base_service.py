@@ -1,8 +1,10 @@
 import pytest
 import requests
 import asyncio
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, AsyncMock, patch
 import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
 
 from pytsetmc_api.services.base_service import BaseService
 from pytsetmc_api.exceptions import TSETMCNetworkError, TSETMCAPIError, TSETMCRateLimitError, TSETMCValidationError
@@ -12,11 +14,30 @@ class ConcreteService(BaseService):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def service():
     """Fixture to create a ConcreteService instance."""
     return ConcreteService(base_url="http://test.com")
 
+@pytest.fixture(scope="module")
+def patched_session(service):
+    """Patch request on the service's cached session once for the module."""
+    with patch.object(service._get_session(), 'request') as mock_request:
+        yield mock_request
+
+@pytest.fixture
+def mock_request(patched_session):
+    """The patched session request, cleared of earlier tests' configuration."""
+    patched_session.reset_mock(return_value=True, side_effect=True)
+    return patched_session
+
+@pytest.fixture(autouse=True)
+def restore_rate_limit_state(service):
+    """Undo rate limiting changes made by a test on the shared service."""
+    state = (service._min_request_interval, service._last_request_time)
+    yield
+    service._min_request_interval, service._last_request_time = state
+
 def test_base_service_initialization(service):
     """Test if BaseService initializes correctly."""
     assert service.base_url == "http://test.com"
@@ -57,67 +78,104 @@ def test_rate_limit(mock_time, mock_sleep, service):
     mock_sleep.assert_not_called()
     assert service._last_request_time == 1001.0
 
-@patch('requests.Session.request')
-def test_make_request_success(mock_request, service):
-    """Test a successful synchronous request."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.ok = True
-    mock_request.return_value = mock_response
+def test_rate_limit_concurrent(service):
+    """Test requests from several threads are still spaced by the minimum interval."""
+    service._min_request_interval = 1.0
+    service._last_request_time = 0
+    clock = [1000.0]
+    sleeps = []
     
-    response = service._make_request("http://test.com/api")
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
     
-    mock_request.assert_called_once()
-    assert response == mock_response
-
-@patch('requests.Session.request', side_effect=requests.exceptions.Timeout)
-def test_make_request_timeout(mock_request, service):
-    """Test a synchronous request that times out."""
-    with pytest.raises(TSETMCNetworkError, match="Request timeout"):
-        service._make_request("http://test.com/api")
-
-@patch('requests.Session.request')
-def test_make_request_http_error(mock_request, service):
-    """Test a synchronous request with an HTTP error."""
+    # A fake clock that only advances when slept on: each caller after the
+    # first must wait the full interval, which holds only if the check and
+    # the update happen atomically
+    fake_time = MagicMock(time=lambda: clock[0], sleep=fake_sleep)
+    with patch('pytsetmc_api.services.base_service.time', fake_time):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: service._rate_limit(), range(4)))
+    
+    assert sleeps == [pytest.approx(1.0)] * 3
+    assert service._last_request_time == 1003.0
+
+def test_get_session_concurrent():
+    """Test concurrent first calls share a single session."""
+    fresh = ConcreteService(base_url="http://test.com")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        sessions = list(executor.map(lambda _: fresh._get_session(), range(4)))
+    assert all(session is sessions[0] for session in sessions)
+
+@pytest.mark.parametrize("status_code, side_effect, expected_exc, match", [
+    (200, None, None, None),
+    (None, requests.exceptions.Timeout, TSETMCNetworkError, "Request timeout"),
+    (500, None, TSETMCAPIError, "HTTP 500: Server Error"),
+    (429, None, TSETMCRateLimitError, "Rate limit exceeded"),
+], ids=["success", "timeout", "http_error", "rate_limit_error"])
+def test_make_request(mock_request, service, status_code, side_effect, expected_exc, match):
+    """Test a synchronous request that succeeds, times out or gets an HTTP error."""
     mock_response = MagicMock()
-    mock_response.status_code = 500
-    mock_response.ok = False
+    mock_response.status_code = status_code
+    mock_response.ok = status_code == 200
     mock_response.reason = "Server Error"
     mock_request.return_value = mock_response
-
-    with pytest.raises(TSETMCAPIError, match="HTTP 500: Server Error"):
-        service._make_request("http://test.com/api")
-
-@patch('requests.Session.request')
-def test_make_request_rate_limit_error(mock_request, service):
-    """Test a synchronous request with a rate limit error."""
-    mock_response = MagicMock()
-    mock_response.status_code = 429
-    mock_request.return_value = mock_response
-
-    with pytest.raises(TSETMCRateLimitError, match="Rate limit exceeded"):
-        service._make_request("http://test.com/api")
-
-@pytest.mark.asyncio
+    mock_request.side_effect = side_effect
+    
+    if expected_exc is None:
+        response = service._make_request("http://test.com/api")
+        mock_request.assert_called_once()
+        assert response == mock_response
+    else:
+        with pytest.raises(expected_exc, match=match):
+            service._make_request("http://test.com/api")
+
+def _async_cm(response):
+    """An async context manager yielding the given response."""
+    cm = AsyncMock()
+    cm.__aenter__.return_value = response
+    return cm
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_make_async_request_success(service, mocker):
     """Test a successful asynchronous request."""
     mock_session = MagicMock()
     mock_response = MagicMock()
     mock_response.status = 200
+    mock_response.read = AsyncMock()
     
     # The response from session.request is an async context manager
-    class AsyncContextManager:
-        async def __aenter__(self):
-            return mock_response
-        async def __aexit__(self, exc_type, exc, tb):
-            pass
-
-    mock_session.request.return_value = AsyncContextManager()
+    mock_session.request.return_value = _async_cm(mock_response)
     
     response = await service._make_async_request(mock_session, "http://test.com/api")
     
     assert response == mock_response
     mock_session.request.assert_called_once()
+    mock_response.read.assert_awaited_once()
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_make_async_request_retries_throttled(service):
+    """Test that 429/503 responses are retried, honoring Retry-After."""
+    throttled = MagicMock(status=429, headers={'Retry-After': '2'})
+    unavailable = MagicMock(status=503, headers={})
+    ok = MagicMock(status=200, read=AsyncMock())
+
+    mock_session = MagicMock()
+    mock_session.request.side_effect = [_async_cm(r) for r in (throttled, unavailable, ok)]
+
+    with patch('pytsetmc_api.services.base_service.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+        response = await service._make_async_request(mock_session, "http://test.com/api")
+
+    assert response is ok
+    assert mock_session.request.call_count == 3
+    # Retry-After first, then the doubled default backoff (plus jitter)
+    assert 2.0 <= mock_sleep.call_args_list[0][0][0] <= 2.2
+    assert 2.0 <= mock_sleep.call_args_list[1][0][0] <= 2.2
+
+    mock_session.request.side_effect = [_async_cm(throttled) for _ in range(service.max_retries + 1)]
+    with patch('pytsetmc_api.services.base_service.asyncio.sleep', new_callable=AsyncMock):
+        with pytest.raises(TSETMCRateLimitError):
+            await service._make_async_request(mock_session, "http://test.com/api")
 
 def test_validate_date_range(service):
     """Test date range validation."""
@@ -135,6 +193,12 @@ def test_validate_date_range(service):
     with pytest.raises(TSETMCValidationError, match="Start date must be before end date"):
         service._validate_date_range("1402-01-01", "1403-01-01")
 
+@pytest.mark.parametrize("bad_date", [["1404-01-01"], {"date": "1404-01-01"}], ids=["list", "dict"])
+def test_validate_date_range_non_string(service, bad_date):
+    """Test unhashable non-string dates raise a validation error, not a TypeError."""
+    with pytest.raises(TSETMCValidationError):
+        service._validate_date_range(bad_date, "1404-01-01")
+
 def test_validate_stock_name(service):
     """Test stock name validation."""
     # Valid
@@ -148,6 +212,20 @@ def test_validate_stock_name(service):
     with pytest.raises(TSETMCValidationError, match="Stock name must be a non-empty string"):
         service._validate_stock_name(None)
 
+def test_clean_dataframe(service):
+    """Test DataFrame cleaning, including frames derived from a cleaned one."""
+    df = pd.DataFrame({'Price': [100, 101], 'Name': ['a', 'b'], 'Empty': [None, None]})
+    
+    cleaned = service._clean_dataframe(df)
+    assert list(cleaned.columns) == ['Price', 'Name']
+    
+    # Slices inherit attrs from their parent, so they must still be cleaned
+    derived = cleaned.reindex([0, 1, 2]).iloc[1:]
+    derived['Volume'] = pd.Series(['5', None], index=derived.index, dtype=object)
+    recleaned = service._clean_dataframe(derived)
+    assert list(recleaned.index) == [1]
+    assert recleaned['Volume'].tolist() == [5]
+
 def test_build_url(service):
     """Test URL building."""
     assert service._build_url("/api/test") == "http://test.com/api/test"
@@ -155,4 +233,4 @@ def test_build_url(service):
 
 
 if __name__ == "__main__": 
-    pytest.main() 
\ No newline at end of file
+    pytest.main([__file__])
\ No newline at end of file
@@ -3,37 +3,48 @@ import pandas as pd
 from unittest.mock import patch, MagicMock
 
 from pytsetmc_api.services.data_service import DataService
-from pytsetmc_api.services.price_service import PriceService
-from pytsetmc_api.services.stock_service import StockService
 from pytsetmc_api.exceptions import TSETMCDataError
 
-@pytest.fixture
-def mock_price_service():
-    """Fixture for a mocked PriceService."""
-    mock = MagicMock(spec=PriceService)
-    # Sample history for stock 'A'
-    history_a = pd.DataFrame({'Adj Close': [100, 101]}, index=['1404-01-01', '1404-01-02'])
-    history_a.columns.name = 'A'
-    # Sample history for stock 'B'
-    history_b = pd.DataFrame({'Adj Close': [200, 202]}, index=['1404-01-01', '1404-01-02'])
-    history_b.columns.name = 'B'
-    
-    mock.get_history.side_effect = lambda stock, **kwargs: {
-        'A': history_a,
-        'B': history_b
-    }.get(stock, pd.DataFrame())
-    return mock
+_EMPTY_DF = pd.DataFrame()
+
+_MARKET_STOCKS_HTML = """
+<table class="table1">
+    <tr><td><a href="...&i=123">TickerA</a></td></tr>
+    <tr><td><a href="...&i=456" title="Stock B">TickerB</a></td></tr>
+</table>
+"""
+
+class _StubPriceService:
+    """Stand-in for PriceService with only the method DataService calls."""
+
+    def __init__(self, history_map):
+        self.get_history = MagicMock(
+            side_effect=lambda stock, **kwargs: history_map.get(stock, _EMPTY_DF)
+        )
 
-@pytest.fixture
+    def reset_mock(self, **kwargs):
+        self.get_history.reset_mock(**kwargs)
+
+@pytest.fixture(scope="module")
+def mock_price_service(history_a, history_b):
+    """Fixture for a stubbed PriceService."""
+    return _StubPriceService({'A': history_a, 'B': history_b})
+
+@pytest.fixture(scope="module")
 def data_service(mock_price_service):
     """Fixture to create a DataService instance with mocked dependencies."""
-    with patch('logging.getLogger'), \
-         patch('tsetmc.services.data_service.StockService'), \
-         patch('tsetmc.services.data_service.PriceService', return_value=mock_price_service):
+    with patch('pytsetmc_api.services.data_service.StockService'), \
+         patch('pytsetmc_api.services.data_service.PriceService', return_value=mock_price_service):
         service = DataService(base_url="http://test.com")
         service.price_service = mock_price_service
         return service
 
+@pytest.fixture(autouse=True)
+def reset_mock_price_service(mock_price_service):
+    """Clear calls and return values set on the shared mock by earlier tests."""
+    yield
+    mock_price_service.reset_mock(return_value=True)
+
 def test_build_stock_list_simple(data_service):
     """Test build_stock_list without fetching detailed info."""
     mock_bourse_stocks = [{'Ticker': 'A', 'Name': 'Stock A', 'WEB-ID': '1', 'Market': 'Bourse'}]
@@ -85,14 +96,8 @@ def test_build_price_panel_no_data(data_service, mock_price_service):
 
 def test_get_market_stocks(data_service):
     """Test the parsing of market stocks from HTML."""
-    html_content = """
-    <table class="table1">
-        <tr><td><a href="...&i=123">TickerA</a></td></tr>
-        <tr><td><a href="...&i=456" title="Stock B">TickerB</a></td></tr>
-    </table>
-    """
     mock_response = MagicMock()
-    mock_response.text = html_content
+    mock_response.text = _MARKET_STOCKS_HTML
     
     with patch.object(data_service, '_make_request', return_value=mock_response):
         stocks = data_service._get_market_stocks("some_id", "some_market")
@@ -103,4 +108,4 @@ def test_get_market_stocks(data_service):
     assert stocks[1]['WEB-ID'] == '456'
 
 if __name__ == "__main__": 
-    pytest.main() 
\ No newline at end of file
+    pytest.main([__file__])
\ No newline at end of file
@@ -5,14 +5,19 @@ from unittest.mock import patch, MagicMock
 from pytsetmc_api.services.market_service import MarketService, IndexType
 from pytsetmc_api.exceptions import TSETMCValidationError, TSETMCDataError
 
-@pytest.fixture
+# Market watch payloads: the main response carries price and order book
+# rows after two '@' separated header sections
+_MW_PRICE_DATA = "1234,CODE,Ticker,Name,10:30,100,102,101,10,1000,100000,99,103,98,1.0,20000,x,y,SCTOR,105,95,5000000,MKTID"
+_MW_OB_DATA = "1234,1,1,1,100,101,50,60"
+_MW_TEXT = f"@@{_MW_PRICE_DATA}@{_MW_OB_DATA}"
+_MW_RI_TEXT = "1234,10,5,100,50,8,4,90,40"
+
+@pytest.fixture(scope="module")
 def market_service():
     """Fixture to create a MarketService instance."""
-    with patch('logging.getLogger'):
-        service = MarketService(base_url="http://test.com")
-        return service
+    return MarketService(base_url="http://test.com")
 
-@patch('tsetmc.services.market_service.MarketService._make_request')
+@patch('pytsetmc_api.services.market_service.MarketService._make_request')
 def test_get_index_history_success(mock_make_request, market_service):
     """Test a successful call to get_index_history."""
     # Mock response for new API (adj close)
@@ -55,25 +60,13 @@ def test_get_index_history_invalid_type(market_service):
             end_date='1404-01-02'
         )
 
-@patch('tsetmc.services.market_service.MarketService._make_request')
+@patch('pytsetmc_api.services.market_service.MarketService._make_request')
 def test_get_market_watch_success(mock_make_request, market_service):
     """Test a successful call to get_market_watch."""
-    # Mock responses for the three requests in get_market_watch
-    mock_mw_response = MagicMock()
-    mock_mw_response.text = "Header@SomeSettings@1234,CODE,Ticker,Name,10:30,1,2,3,4,5,6,7,8,9,10,11,12,3,4@ob_data"
-    
-    mock_ri_response = MagicMock()
-    mock_ri_response.text = "1234,1,2,3,4,5,6,7,8"
-    
-    mock_ob_response = MagicMock() # This is inside the main response now
-    # The third part of the main response is the order book data
-    price_data = "1234,CODE,Ticker,Name,10:30,100,102,101,10,1000,100000,99,103,98,1.0,20000,x,y,SCTOR,105,95,5000000,MKTID"
-    ob_data = "1234,1,1,1,100,101,50,60"
-    ri_data = "1234,10,5,100,50,8,4,90,40"
-    
+    # Mock responses for the market watch and client type requests
     mock_make_request.side_effect = [
-        MagicMock(text=f"@@{price_data}@{ob_data}"),
-        MagicMock(text=ri_data)
+        MagicMock(text=_MW_TEXT),
+        MagicMock(text=_MW_RI_TEXT)
     ]
     
     # Mock sector mapping to avoid another request
@@ -95,4 +88,4 @@ def test_get_market_watch_success(mock_make_request, market_service):
     assert df_ob.iloc[0]['Buy-Price'] == 100
 
 if __name__ == "__main__": 
-    pytest.main() 
\ No newline at end of file
+    pytest.main([__file__])
\ No newline at end of file
@@ -3,63 +3,61 @@ import pandas as pd
 from unittest.mock import patch, MagicMock
 
 from pytsetmc_api.services.price_service import PriceService
-from pytsetmc_api.services.stock_service import StockService
 from pytsetmc_api.exceptions import TSETMCDataError, TSETMCValidationError
 from pytsetmc_api.models import StockInfo, MarketType
 
-@pytest.fixture
+class _StubStockService:
+    """Stand-in for StockService with only the methods PriceService calls."""
+
+    def __init__(self):
+        self.get_web_id = MagicMock(return_value="12345")
+        self.get_stock_info = MagicMock(return_value=StockInfo(
+            name='Test Stock', ticker='TEST', web_id='12345',
+            market=MarketType.BOURSE, isin='IRTest'
+        ))
+
+    def reset_mock(self, **kwargs):
+        self.get_web_id.reset_mock(**kwargs)
+        self.get_stock_info.reset_mock(**kwargs)
+
+@pytest.fixture(scope="module")
 def mock_stock_service():
-    """Fixture for a mocked StockService."""
-    mock = MagicMock(spec=StockService)
-    mock.get_web_id.return_value = "12345"
-    mock.get_stock_info.return_value = StockInfo(
-        name='Test Stock', ticker='TEST', web_id='12345',
-        market=MarketType.BOURSE, isin='IRTest'
-    )
-    return mock
+    """Fixture for a stubbed StockService."""
+    return _StubStockService()
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def price_service(mock_stock_service):
     """Fixture to create a PriceService instance with mocked dependencies."""
-    with patch('logging.getLogger'), patch('tsetmc.services.price_service.StockService', return_value=mock_stock_service):
+    with patch('pytsetmc_api.services.price_service.StockService', return_value=mock_stock_service):
         service = PriceService(base_url="http://test.com")
         service.stock_service = mock_stock_service
         return service
 
-def test_get_history_success(price_service, mock_stock_service):
-    """Test a successful call to get_history."""
-    mock_df = pd.DataFrame({'Close': [1000, 1010]})
-    
-    with patch.object(price_service, '_fetch_price_data', return_value=mock_df) as mock_fetch:
-        result_df = price_service.get_history(
-            stock="test",
-            start_date="1404-01-01",
-            end_date="1404-01-02"
-        )
+@pytest.fixture(autouse=True)
+def reset_mock_stock_service(mock_stock_service):
+    """Clear calls recorded on the shared mock by earlier tests."""
+    yield
+    mock_stock_service.reset_mock()
+
+@pytest.mark.parametrize("start_date, end_date, fetched, expected_exc", [
+    ("1404-01-01", "1404-01-02", pd.DataFrame({'Close': [1000, 1010]}), None),
+    ("1404-01-01", "1404-01-02", pd.DataFrame(), TSETMCDataError),
+    ("1404-01-02", "1404-01-01", pd.DataFrame(), TSETMCValidationError),
+], ids=["success", "no_data", "invalid_date"])
+def test_get_history(price_service, mock_stock_service, start_date, end_date, fetched, expected_exc):
+    """Test get_history with data, without data and with an invalid date range."""
+    with patch.object(price_service, '_fetch_price_data', return_value=fetched) as mock_fetch:
+        if expected_exc is not None:
+            with pytest.raises(expected_exc):
+                price_service.get_history(stock="test", start_date=start_date, end_date=end_date)
+            return
+        
+        result_df = price_service.get_history(stock="test", start_date=start_date, end_date=end_date)
         
         mock_stock_service.get_web_id.assert_called_once_with("test")
         mock_fetch.assert_called_once()
         assert not result_df.empty
 
-def test_get_history_no_data(price_service):
-    """Test get_history when no data is returned."""
-    with patch.object(price_service, '_fetch_price_data', return_value=pd.DataFrame()):
-        with pytest.raises(TSETMCDataError):
-            price_service.get_history(
-                stock="test",
-                start_date="1404-01-01",
-                end_date="1404-01-02"
-            )
-
-def test_get_history_invalid_date(price_service):
-    """Test get_history with an invalid date range."""
-    with pytest.raises(TSETMCValidationError):
-        price_service.get_history(
-            stock="test",
-            start_date="1404-01-02",
-            end_date="1404-01-01"
-        )
-
 def test_get_ri_history_success(price_service, mock_stock_service):
     """Test a successful call to get_ri_history."""
     mock_df = pd.DataFrame({'RI': [1, 1.01]})
@@ -90,19 +88,14 @@ def test_get_usd_rial_history_success(price_service):
         assert mock_fetch.call_args[1]['web_id'] == "46348559193224090"
         assert not result_df.empty
 
-def test_format_price_data_with_options(price_service):
+def test_format_price_data_with_options(price_service, price_df):
     """Test the _format_price_data method with all options enabled."""
-    input_df = pd.DataFrame({
-        'Date': ['1404-01-05', '1404-01-06'], # Thursday, Friday
-        'Close': [100, 101]
-    })
-    
     # We need to patch the conversion utility function
-    with patch('tsetmc.services.price_service.convert_jalali_to_gregorian') as mock_convert:
+    with patch('pytsetmc_api.services.price_service.convert_jalali_to_gregorian') as mock_convert:
         mock_convert.side_effect = ['2021-03-25', '2021-03-26']
         
         formatted_df = price_service._format_price_data(
-            input_df.copy(),
+            price_df.copy(),
             show_weekday=True,
             double_date=True
         )
@@ -113,4 +106,4 @@ def test_format_price_data_with_options(price_service):
 
 
 if __name__ == "__main__": 
-    pytest.main() 
\ No newline at end of file
+    pytest.main([__file__])
\ No newline at end of file
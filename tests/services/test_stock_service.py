@@ -1,36 +1,44 @@
 import pytest
 import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 
-from pytsetmc_api.services.stock_service import StockService
+from pytsetmc_api.services.stock_service import StockService, _MARKET_BY_FLOW, _STOCK_MAPPING
 from pytsetmc_api.exceptions import TSETMCNotFoundError, TSETMCValidationError
-from pytsetmc_api.models import StockInfo, MarketType
+from pytsetmc_api.models import StockInfo
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def stock_service():
     """Fixture to create a StockService instance with a mocked logger."""
-    with patch('logging.getLogger') as mock_logger:
-        service = StockService(base_url="http://test.com")
-        service.logger = mock_logger
-        return service
+    return StockService(base_url="http://test.com")
+
+@pytest.fixture(autouse=True)
+def reset_new_api_breaker(monkeypatch):
+    """Isolate the class-level new search endpoint breaker between tests."""
+    monkeypatch.setattr(StockService, '_new_api_failures', 0)
+    monkeypatch.setattr(StockService, '_new_api_skip_until', 0.0)
 
 def test_search_success(stock_service):
-    """Test a successful stock search."""
-    mock_response = MagicMock()
-    mock_response.text = "پترول,پترول,12345,بازار اول,شیمیایی,IR123"
+    """Test a successful stock search through the old endpoint."""
+    html_response = MagicMock(content=b"<html>error</html>")
+    data_response = MagicMock(text="پترول,پترول,12345,بازار اول,شیمیایی,IR123")
     
-    with patch.object(stock_service, '_make_request', return_value=mock_response) as mock_make_request:
+    with patch.object(stock_service, '_make_request', side_effect=[html_response, data_response]) as mock_make_request, \
+         patch.object(stock_service, '_new_search_rows') as mock_new_search_rows:
         result_df = stock_service.search("پترول")
         
-        mock_make_request.assert_called_once()
+        # The new endpoint's HTML error page is never parsed as JSON
+        mock_new_search_rows.assert_not_called()
+        assert mock_make_request.call_count == 2
+        assert 'search.aspx' in mock_make_request.call_args[0][0]
         assert not result_df.empty
         assert 'Name' in result_df.columns
         assert result_df.iloc[0]['Symbol'] == 'پترول'
 
 def test_search_not_found(stock_service):
     """Test a stock search that returns no results."""
-    mock_response = MagicMock()
-    mock_response.text = ""
+    mock_response = MagicMock(content=b"", text="")
     
     with patch.object(stock_service, '_make_request', return_value=mock_response):
         with pytest.raises(TSETMCNotFoundError):
@@ -43,16 +51,16 @@ def test_search_invalid_query(stock_service):
 
 def test_get_stock_info_success(stock_service):
     """Test successfully getting stock info."""
-    search_result = pd.DataFrame([{
+    search_result = {
         'Name': 'پترول جم',
         'Symbol': 'پترول',
         'WebID': '12345',
         'Market': 'بازار اول',
         'Sector': 'شیمیایی',
         'ISIN': 'IR123'
-    }])
+    }
     
-    with patch.object(stock_service, 'search', return_value=search_result) as mock_search:
+    with patch.object(stock_service, '_search_first', return_value=search_result) as mock_search:
         stock_info = stock_service.get_stock_info("پترول")
         
         mock_search.assert_called_once_with("پترول")
@@ -62,37 +70,173 @@ def test_get_stock_info_success(stock_service):
 
 def test_get_stock_info_not_found(stock_service):
     """Test getting info for a stock that is not found."""
-    with patch.object(stock_service, 'search', return_value=pd.DataFrame()):
+    with patch.object(stock_service, '_search_first', return_value=None):
         with pytest.raises(TSETMCNotFoundError):
             stock_service.get_stock_info("없는주식")
 
 def test_get_web_id_success(stock_service):
     """Test successfully getting a stock's web ID."""
-    mock_stock_info = StockInfo(
-        name='پترول جم', ticker='پترول', web_id='12345',
-        market=MarketType.BOURSE, isin='IR123'
-    )
+    search_result = {'Name': 'پترول جم', 'Symbol': 'پترول', 'WebID': '12345'}
     
-    with patch.object(stock_service, 'get_stock_info', return_value=mock_stock_info) as mock_get_info:
+    with patch.object(stock_service, '_search_first', return_value=search_result) as mock_search:
         web_id = stock_service.get_web_id("پترول")
         
-        mock_get_info.assert_called_once_with("پترول")
+        mock_search.assert_called_once_with("پترول")
         assert web_id == '12345'
 
-def test_parse_search_response(stock_service):
-    """Test the parsing of a search response."""
-    response_text = "نام شرکت,نماد,وب‌آی‌دی,بازار;شرکت دوم,نماد۲,وب۲,بازار۲"
-    df = stock_service._parse_search_response(response_text)
+def test_search_first(stock_service):
+    """Test the single-result search returns a cleaned record."""
+    html_response = MagicMock(content=b"<html>error</html>")
+    data_response = MagicMock(text="پترول جم,پترول,12345,بازار اول,شيميايي,IR123;دوم,دوم,678,بازار دوم")
+    
+    with patch.object(stock_service, '_make_request', side_effect=[html_response, data_response]) as mock_make_request:
+        record = stock_service._search_first("پترول")
+    
+    assert mock_make_request.call_count == 2
+    
+    assert record['WebID'] == '12345'
+    assert record['Sector'] == 'شیمیایی'
+
+def test_demo_result(stock_service):
+    """Test search and _search_first build the same placeholder when nothing matches."""
+    mock_response = MagicMock(content=b"", text="")
+    
+    with patch.object(stock_service, '_make_request', return_value=mock_response):
+        df = stock_service.search("ناموجود")
+        record = stock_service._search_first("ناموجود")
+    
+    assert df.iloc[0]['Name'] == record['Name'] == 'Demo Stock for ناموجود'
+    assert df.iloc[0]['Symbol'] == record['Symbol'] == 'ناموجو'
+
+def test_is_verified_web_id(stock_service):
+    """Test that only IDs outside the offline fallbacks count as verified."""
+    assert stock_service.is_verified_web_id("12345")
+    assert not stock_service.is_verified_web_id(_STOCK_MAPPING['خودرو']['WebID'])
+    assert not stock_service.is_verified_web_id(stock_service._demo_frame("test").iloc[0]['WebID'])
+
+def test_query_search_endpoints_old(stock_service):
+    """Test rows are parsed from the old endpoint's semicolon separated response."""
+    html_response = MagicMock(content=b"<html>error</html>")
+    data_response = MagicMock(text="نام شرکت,نماد,وب‌آی‌دی,بازار;شرکت دوم,نماد۲,وب۲,بازار۲")
+    
+    with patch.object(stock_service, '_make_request', side_effect=[html_response, data_response]):
+        rows = stock_service._query_search_endpoints("نماد")
+    
+    assert len(rows) == 2
+    assert rows[1][:4] == ['شرکت دوم', 'نماد۲', 'وب۲', 'بازار۲']
+    assert rows[1][4:] == ['', '']
+
+def test_query_search_endpoints_empty(stock_service):
+    """Test empty responses from both endpoints give no rows."""
+    mock_response = MagicMock(content=b"", text="")
+    
+    with patch.object(stock_service, '_make_request', return_value=mock_response):
+        assert stock_service._query_search_endpoints("نماد") == []
+
+def test_query_search_endpoints_new(stock_service):
+    """Test rows are decoded from the new endpoint's JSON bytes."""
+    mock_response = MagicMock(content='[{"lVal30": "بانك ملت", "lVal18AFC": "وبملت", "insCode": 778253364357513, "flow": 1, "lSecVal": "بانک", "cIsin": "IRO1BMLT0001"}]'.encode('utf-8'))
+    
+    with patch.object(stock_service, '_make_request', return_value=mock_response) as mock_make_request:
+        df = stock_service._rows_to_frame(stock_service._query_search_endpoints("وبملت"))
     
-    assert isinstance(df, pd.DataFrame)
-    assert len(df) == 2
-    assert df.iloc[1]['Symbol'] == 'نماد۲'
+    mock_make_request.assert_called_once()
+    assert len(df) == 1
+    assert df.iloc[0]['Name'] == 'بانک ملت'
+    assert df.iloc[0]['WebID'] == '778253364357513'
+    assert df.iloc[0]['Market'] == _MARKET_BY_FLOW[1]
+
+def test_parse_sector_stocks(stock_service):
+    """Test parsing of the stocks table from a sector page."""
+    html_content = """
+    <table>
+        <tr><th>نام</th><th>نماد</th><th>قیمت</th><th>تغییر</th></tr>
+        <tr><td><a href="Loader.aspx?ParTree=151311&i=65883838195688438">ايران خودرو</a></td><td>خودرو</td><td>2500</td><td>-30</td><td>-1.2%</td></tr>
+    </table>
+    <table><tr><td>a</td></tr><tr><td>b</td><td>c</td><td>1</td><td>2</td></tr></table>
+    """
+    soup = BeautifulSoup(html_content, 'lxml', parse_only=SoupStrainer('table'))
+    df = stock_service._parse_sector_stocks(soup)
+
+    assert len(df) == 1
+    assert df.iloc[0]['Name'] == 'ایران خودرو'
+    assert df.iloc[0]['WebID'] == '65883838195688438'
+    assert df.iloc[0]['LastPrice'] == 2500
+
+def test_get_sector_web_id(stock_service):
+    """Test sector web ID lookup via the mapping and the cached search."""
+    # Arabic yeh is normalized before the mapping lookup
+    assert stock_service._get_sector_web_id('پتروشيمي') == '35700344742835695'
+
+    mock_response = MagicMock()
+    mock_response.text = "بیمه,بیمه,99887766;"
+    with patch.object(stock_service, '_make_request', return_value=mock_response) as mock_make_request:
+        assert stock_service._get_sector_web_id('بیمه') == '99887766'
+        assert stock_service._get_sector_web_id('بیمه') == '99887766'
+        mock_make_request.assert_called_once()
+
+def test_fallback_search(stock_service):
+    """Test the fallback search over the known stock mapping."""
+    df = stock_service._fallback_search("فولاد")
+    assert len(df) == 1
+    assert df.iloc[0]['Symbol'] == 'فولاد'
+
+    # Partial match on the company name
+    df = stock_service._fallback_search("اصفهان")
+    assert set(df['Symbol']) == {'فولاد', 'ذوب'}
+
+    assert stock_service._fallback_search("ناموجود").empty
+
+def test_get_sector_stocks_many(stock_service):
+    """Test concurrent sector lookups skip sectors that fail."""
+    sector_df = pd.DataFrame({'Symbol': ['خودرو']})
+
+    def fake_get_sector_stocks(name):
+        if name == 'ناموجود':
+            raise TSETMCNotFoundError(f"Sector not found: {name}")
+        return sector_df
+
+    with patch.object(stock_service, 'get_sector_stocks', side_effect=fake_get_sector_stocks):
+        results = stock_service.get_sector_stocks_many(['خودرو', 'بانک', 'ناموجود'])
+
+    assert set(results) == {'خودرو', 'بانک'}
+    assert results['خودرو'] is sector_df
+
+def test_search_skips_failing_new_api(stock_service):
+    """Test the new search endpoint is skipped after repeated failures."""
+    html_response = MagicMock(content=b"<html>error</html>")
+    data_response = MagicMock(text="پترول,پترول,12345,بازار اول,شیمیایی,IR123")
+
+    with patch.object(stock_service, '_make_request') as mock_make_request, \
+         patch.object(stock_service, '_new_search_rows') as mock_new_search_rows:
+        mock_make_request.side_effect = [html_response, data_response] * 3
+        for _ in range(3):
+            stock_service.search("پترول")
+        assert mock_make_request.call_count == 6
+        mock_new_search_rows.assert_not_called()
+
+        # Breaker is open: only the old endpoint is hit
+        mock_make_request.reset_mock(side_effect=True)
+        mock_make_request.return_value = data_response
+        stock_service.search("پترول")
+        mock_make_request.assert_called_once()
+        assert 'search.aspx' in mock_make_request.call_args[0][0]
+
+def test_new_api_breaker_concurrent(stock_service):
+    """Test concurrent failures are all counted by the shared breaker."""
+    def fail_many(_):
+        for _ in range(200):
+            stock_service._record_new_api_result(success=False)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(fail_many, range(8)))
+
+    assert StockService._new_api_failures == 1600
+    assert StockService._new_api_skip_until > 0.0
 
-def test_parse_search_response_empty(stock_service):
-    """Test parsing of an empty search response."""
-    df = stock_service._parse_search_response("")
-    assert isinstance(df, pd.DataFrame)
-    assert df.empty
+    stock_service._record_new_api_result(success=True)
+    assert StockService._new_api_failures == 0
+    assert StockService._new_api_skip_until == 0.0
 
 if __name__ == "__main__": 
-    pytest.main() 
\ No newline at end of file
+    pytest.main([__file__])
\ No newline at end of file
@@ -1,35 +1,61 @@
+import asyncio
+import json
 import pytest
 import pandas as pd
 from unittest.mock import patch, MagicMock, AsyncMock
 
-from pytsetmc_api.services.trading_service import TradingService
-from pytsetmc_api.services.stock_service import StockService
+from pytsetmc_api.services.trading_service import TradingService, _ParquetDayWriter
 from pytsetmc_api.exceptions import TSETMCDataError
+from pytsetmc_api.cache import FileCache
+from pytsetmc_api.services.stock_service import StockService, _STOCK_MAPPING
 
-@pytest.fixture
+class _StubStockService:
+    """Stand-in for StockService with only the methods TradingService calls."""
+
+    def __init__(self):
+        self.get_web_id = MagicMock(return_value="12345")
+        self.is_verified_web_id = StockService.is_verified_web_id
+
+    def reset_mock(self, **kwargs):
+        self.get_web_id.reset_mock(**kwargs)
+
+@pytest.fixture(scope="module")
 def mock_stock_service():
-    """Fixture for a mocked StockService."""
-    mock = MagicMock(spec=StockService)
-    mock.get_web_id.return_value = "12345"
-    return mock
+    """Fixture for a stubbed StockService."""
+    return _StubStockService()
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def trading_service(mock_stock_service):
     """Fixture to create a TradingService instance with mocked dependencies."""
-    with patch('logging.getLogger'), patch('tsetmc.services.trading_service.StockService', return_value=mock_stock_service):
+    with patch('pytsetmc_api.services.trading_service.StockService', return_value=mock_stock_service):
         service = TradingService(base_url="http://test.com")
         service.stock_service = mock_stock_service
-        # Mock the async session getter
-        service._get_session = MagicMock()
         return service
 
-@patch('tsetmc.services.trading_service.asyncio.run')
-@patch('tsetmc.services.trading_service.TradingService._get_trading_days')
+@pytest.fixture(autouse=True)
+def restore_trading_service(trading_service, mock_stock_service):
+    """Undo per-test changes to the shared service and mock."""
+    state = vars(trading_service).copy()
+    yield
+    vars(trading_service).clear()
+    vars(trading_service).update(state)
+    trading_service._web_ids.clear()
+    mock_stock_service.reset_mock()
+
+def _closing_result(result):
+    """asyncio.run stand-in that closes the coroutine it is given and returns result."""
+    def run(coro):
+        coro.close()
+        return result
+    return run
+
+@patch('pytsetmc_api.services.trading_service.asyncio.run')
+@patch('pytsetmc_api.services.trading_service.TradingService._get_trading_days')
 def test_get_intraday_trades_history_success(mock_get_days, mock_async_run, trading_service):
     """Test a successful call to get_intraday_trades_history."""
     mock_get_days.return_value = ['1404-01-01']
     mock_df = pd.DataFrame({'Price': [100]})
-    mock_async_run.return_value = [mock_df] # The mocked gather returns a list of results
+    mock_async_run.side_effect = _closing_result([mock_df]) # The mocked gather returns a list of results
     
     result_df = trading_service.get_intraday_trades_history(
         stock="test",
@@ -41,7 +67,7 @@ def test_get_intraday_trades_history_success(mock_get_days, mock_async_run, trad
     mock_async_run.assert_called_once()
     assert not result_df.empty
 
-@patch('tsetmc.services.trading_service.TradingService._get_trading_days', return_value=[])
+@patch('pytsetmc_api.services.trading_service.TradingService._get_trading_days', return_value=[])
 def test_get_intraday_trades_history_no_days(mock_get_days, trading_service):
     """Test get_intraday_trades_history with no trading days found."""
     with pytest.raises(TSETMCDataError, match="No trading days found"):
@@ -51,59 +77,193 @@ def test_get_intraday_trades_history_no_days(mock_get_days, trading_service):
             end_date="1404-01-02"
         )
 
+def test_concat_frames():
+    """Test column-wise concatenation of per-day frames."""
+    day1 = pd.DataFrame({'J-Date': ['1404-01-01'], 'Price': [100]})
+    day2 = pd.DataFrame({'J-Date': ['1404-01-02', '1404-01-02'], 'Price': [101, 102]})
+    
+    df = TradingService._concat_frames([day1, day2])
+    
+    pd.testing.assert_frame_equal(df, pd.concat([day1, day2], ignore_index=True))
+
+def test_get_web_id_cached(trading_service, mock_stock_service, tmp_path):
+    """Test that web IDs are looked up once and persisted with a cache directory."""
+    trading_service.cache = FileCache(tmp_path)
+    
+    assert trading_service._get_web_id("پترول") == "12345"
+    assert trading_service._get_web_id(" پترول ") == "12345"
+    mock_stock_service.get_web_id.assert_called_once_with("پترول")
+    assert FileCache(tmp_path).get_mapping('web_ids') == {'پترول': '12345'}
+
+def test_get_web_id_skips_fallback_ids(trading_service, mock_stock_service, tmp_path, monkeypatch):
+    """Test web IDs from the offline stock mapping are not remembered."""
+    trading_service.cache = FileCache(tmp_path)
+    monkeypatch.setattr(mock_stock_service.get_web_id, 'return_value', _STOCK_MAPPING['خودرو']['WebID'])
+
+    trading_service._get_web_id("خودرو")
+    trading_service._get_web_id("خودرو")
+
+    assert mock_stock_service.get_web_id.call_count == 2
+    assert FileCache(tmp_path).get_mapping('web_ids') == {}
+
+def test_parquet_day_writer(tmp_path):
+    """Test that days finishing out of order are written in day order, one row group each."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    day1 = pd.DataFrame({'J-Date': ['1404-01-01'], 'Price': [100]})
+    day2 = pd.DataFrame({'J-Date': ['1404-01-02', '1404-01-02'], 'Price': [101, 102]})
+    path = tmp_path / "trades.parquet"
+    
+    writer = _ParquetDayWriter(str(path))
+    writer.add(2, day2)
+    assert writer._pending.keys() == {2}
+    writer.add(1, pd.DataFrame())
+    writer.add(0, day1)
+    assert not writer._pending
+    writer.close()
+    df = writer.read()
+    
+    assert pq.ParquetFile(path).num_row_groups == 2
+    assert list(df['Price']) == [100, 101, 102]
+    assert list(df['J-Date']) == ['1404-01-01', '1404-01-02', '1404-01-02']
+
+def test_parquet_day_writer_differing_dtypes(tmp_path):
+    """Test that a later day with different column dtypes widens the file instead of failing."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    day1 = pd.DataFrame({'Price': [100, 101], 'Volume': [5, 6]})
+    day2 = pd.DataFrame({'Price': [101.5, None], 'Volume': ['7', 'n/a'], 'Flag': [True, False]})
+    day3 = pd.DataFrame({'Price': [102], 'Volume': [8]})
+    path = tmp_path / "trades.parquet"
+    
+    writer = _ParquetDayWriter(str(path))
+    for index, day in enumerate([day1, day2, day3]):
+        writer.add(index, day)
+    writer.close()
+    df = writer.read()
+    
+    assert pq.ParquetFile(path).num_row_groups == 3
+    assert not (tmp_path / "trades.parquet.old").exists()
+    assert df['Price'].tolist()[:3] == [100.0, 101.0, 101.5]
+    assert pd.isna(df['Price'].iloc[3])
+    assert df['Price'].iloc[4] == 102.0
+    assert df['Volume'].tolist() == ['5', '6', '7', 'n/a', '8']
+    assert df['Flag'].iloc[2:4].tolist() == [True, False]
+    assert df['Flag'].iloc[[0, 1, 4]].isna().all()
+
 def test_get_trading_days(trading_service):
     """Test the _get_trading_days method."""
     mock_response = MagicMock()
-    # Dates are 2021-03-21 (1404-01-01) and 2021-03-23 (1404-01-03)
-    mock_response.text = "20210321@data;20210323@data;"
+    # Dates are 2025-03-21 (1404-01-01) and 2025-03-23 (1404-01-03)
+    mock_response.text = "20250321@data;20250323@data;"
     
     with patch.object(trading_service, '_make_request', return_value=mock_response):
         days = trading_service._get_trading_days("12345", "1404-01-01", "1404-01-02")
         
     assert days == ["1404-01-01"] # Only the first date is in range
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fetch_days_uses_cache(trading_service, tmp_path):
+    """Test that closed days are cached and served without refetching."""
+    trading_service.cache = FileCache(tmp_path)
+    day_df = pd.DataFrame({'J-Date': ['1400-01-05'], 'Time': ['09:00:01'], 'Volume': [10], 'Price': [100]})
+    fetch_day = AsyncMock(return_value=day_df)
+    
+    for _ in range(2):
+        results = await trading_service._fetch_days(fetch_day, 'trades', "12345", ['1400-01-05'], False, "Fetching")
+        assert results[0].iloc[0]['Price'] == 100
+    
+    fetch_day.assert_awaited_once()
+    assert fetch_day.await_args[0][1:] == ("12345", '1400-01-05', '20210325')
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_run_async_inside_running_loop(trading_service):
+    """Test coroutines still run when called from inside an event loop."""
+    async def answer():
+        return 42
+    
+    assert trading_service._run_async(answer()) == 42
+
+def test_run_async_keeps_event_loop_policy(trading_service):
+    """Test the Windows selector loop is used without replacing the global policy."""
+    async def loop_type():
+        return type(asyncio.get_running_loop())
+    
+    policy = asyncio.get_event_loop_policy()
+    with patch('pytsetmc_api.services.trading_service.sys.platform', 'win32'):
+        assert issubclass(trading_service._run_async(loop_type()), asyncio.SelectorEventLoop)
+    assert asyncio.get_event_loop_policy() is policy
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fetch_days_streams_to_callback(trading_service):
+    """Test that with on_day each finished day is handed over and not kept."""
+    day_df = pd.DataFrame({'Price': [100]})
+    fetch_day = AsyncMock(return_value=day_df)
+    on_day = MagicMock()
+    
+    results = await trading_service._fetch_days(
+        fetch_day, 'trades', "12345", ['1404-01-01', '1404-01-02'], False, "Fetching", on_day=on_day
+    )
+    
+    assert results == [None, None]
+    assert sorted(call.args[0] for call in on_day.call_args_list) == [0, 1]
+    assert all(call.args[1] is day_df for call in on_day.call_args_list)
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_fetch_day_trades(trading_service):
     """Test the _fetch_day_trades async method."""
     mock_response = AsyncMock()
-    mock_response.json.return_value = {
-        'tradeHistory': [{'iSens', 'nTran', 'hEven', 'qTitTran', 'pTran', 'qTitNgJ'}]
-    }
+    mock_response.read.return_value = json.dumps({
+        'tradeHistory': [
+            {'insCode': None, 'dEven': 0, 'nTran': 2, 'hEven': 90005, 'qTitTran': 50, 'pTran': 101.0, 'qTitNgJ': 0},
+            {'insCode': None, 'dEven': 0, 'nTran': 1, 'hEven': 90001, 'qTitTran': 100, 'pTran': 100.0, 'qTitNgJ': 0},
+        ]
+    }).encode()
     
     trading_service._make_async_request = AsyncMock(return_value=mock_response)
     
-    df = await trading_service._fetch_day_trades("12345", "1404-01-01")
+    df = await trading_service._fetch_day_trades(MagicMock(), "12345", "1404-01-01", "20250321")
     
     assert isinstance(df, pd.DataFrame)
-    # The parsing logic in the original code is faulty, so this test may need adjustment
-    # based on the expected (or corrected) parsing logic. For now, check not empty.
-    # assert not df.empty 
+    assert list(df.columns) == ['J-Date', 'Time', 'Volume', 'Price']
+    assert list(df['Time']) == ['09:00:01', '09:00:05']
+    assert list(df['Volume']) == [100, 50]
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_fetch_day_ob(trading_service):
     """Test the _fetch_day_ob async method."""
     mock_threshold_response = AsyncMock()
-    mock_threshold_response.json.return_value = {
+    mock_threshold_response.read.return_value = json.dumps({
         'staticThreshold': [{'psGelStaMax': 105, 'psGelStaMin': 95}]
-    }
+    }).encode()
     
     mock_ob_response = AsyncMock()
-    mock_ob_response.json.return_value = {
+    mock_ob_response.read.return_value = json.dumps({
         'bestLimitsHistory': [{
+            'hEven': 90000, 'number': 2, 'zOrdMeDem': 3, 'qTitMeDem': 300,
+            'pMeDem': 98, 'pMeOf': 102, 'qTitMeOf': 200, 'zOrdMeOf': 5,
+            'iE': 1, 'dEven': 20210321, 'instrument': 'IRO1', 'insCode': '123'
+        }, {
             'hEven': 90000, 'number': 1, 'zOrdMeDem': 10, 'qTitMeDem': 100,
             'pMeDem': 99, 'pMeOf': 101, 'qTitMeOf': 120, 'zOrdMeOf': 12,
             'iE': 1, 'dEven': 20210321, 'instrument': 'IRO1', 'insCode': '123'
+        }, {
+            'hEven': 80000, 'number': 1, 'zOrdMeDem': 1, 'qTitMeDem': 1,
+            'pMeDem': 1, 'pMeOf': 1, 'qTitMeOf': 1, 'zOrdMeOf': 1,
+            'iE': 1, 'dEven': 20210321, 'instrument': 'IRO1', 'insCode': '123'
         }]
-    }
+    }).encode()
     
     trading_service._make_async_request = AsyncMock(side_effect=[mock_threshold_response, mock_ob_response])
     
-    df = await trading_service._fetch_day_ob("12345", "1404-01-01")
+    df = await trading_service._fetch_day_ob(MagicMock(), "12345", "1404-01-01", "20250321")
     
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
     assert 'Day_UL' in df.columns
     assert df.iloc[0]['Day_UL'] == 105
+    # Pre-open rows are dropped and levels are sorted by depth
+    assert list(df['Depth']) == [1, 2]
+    assert df.iloc[0]['Time'] == '09:00:00'
+    assert df.iloc[0]['Buy_Vol'] == 100
 
 if __name__ == "__main__": 
-    pytest.main() 
\ No newline at end of file
+    pytest.main([__file__])
\ No newline at end of file
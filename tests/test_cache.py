@@ -0,0 +1,48 @@
+import os
+import pytest
+import pandas as pd
+
+from pytsetmc_api.cache import FileCache
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture to create a FileCache in a temporary directory."""
+    return FileCache(tmp_path)
+
+def test_cache_round_trip(cache):
+    """Test that a stored DataFrame is returned unchanged."""
+    df = pd.DataFrame({'J-Date': ['1404-01-05'], 'Time': ['09:00:01'], 'Volume': [100], 'Price': [2500.5]})
+    
+    assert cache.get("trades", "12345", "1404-01-05") is None
+    cache.set("trades", "12345", "1404-01-05", df)
+    
+    cached = cache.get("trades", "12345", "1404-01-05")
+    assert cache.path("trades", "12345", "1404-01-05").exists()
+    pd.testing.assert_frame_equal(cached, df, check_dtype=False)
+    assert cached.iloc[0]['Time'] == '09:00:01'
+
+def test_cache_expired(cache):
+    """Test that entries older than the TTL are ignored."""
+    cache.set("trades", "12345", "1404-01-05", pd.DataFrame({'Price': [1]}))
+    path = cache.path("trades", "12345", "1404-01-05")
+    old = path.stat().st_mtime - cache.ttl - 1
+    os.utime(path, (old, old))
+    
+    assert cache.get("trades", "12345", "1404-01-05") is None
+
+def test_mapping_round_trip_and_expiry(cache):
+    """Test mappings are stored, expire with the TTL and can be deleted."""
+    assert cache.get_mapping('web_ids') == {}
+    cache.set_mapping('web_ids', {'پترول': '12345'})
+    assert cache.get_mapping('web_ids') == {'پترول': '12345'}
+
+    cache.delete_mapping('web_ids')
+    assert cache.get_mapping('web_ids') == {}
+
+    cache.set_mapping('web_ids', {'پترول': '12345'})
+    cache.ttl = -1
+    assert cache.get_mapping('web_ids') == {}
+
+
+if __name__ == "__main__": 
+    pytest.main([__file__])
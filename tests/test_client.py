@@ -1,3 +1,4 @@
+from types import MappingProxyType
 import pytest
 from unittest.mock import MagicMock, patch
 import pandas as pd
@@ -10,23 +11,120 @@ from pytsetmc_api.services.trading_service import TradingService
 from pytsetmc_api.services.data_service import DataService
 
 
-@pytest.fixture
-def mock_services(mocker):
-    """Fixture to mock all services."""
-    mocker.patch('tsetmc.client.StockService', return_value=MagicMock(spec=StockService))
-    mocker.patch('tsetmc.client.PriceService', return_value=MagicMock(spec=PriceService))
-    mocker.patch('tsetmc.client.MarketService', return_value=MagicMock(spec=MarketService))
-    mocker.patch('tsetmc.client.TradingService', return_value=MagicMock(spec=TradingService))
-    mocker.patch('tsetmc.client.DataService', return_value=MagicMock(spec=DataService))
-    mocker.patch('tsetmc.client.setup_logging')
-
-
-@pytest.fixture
+# Every test runs against mocked services. The shared module-scoped mocks
+# must stay on one xdist worker, which --dist=loadfile already ensures and
+# the group keeps true under --dist=loadgroup.
+pytestmark = [
+    pytest.mark.usefixtures("mock_services"),
+    pytest.mark.xdist_group("client_tests"),
+]
+
+# Frames returned by the mocked services
+_DF_RESULT = pd.DataFrame({'result': [1]})
+_DF_PRICE = pd.DataFrame({'price': [100]})
+_DF_INDEX = pd.DataFrame({'index': [1000]})
+_DF_TRADES = pd.DataFrame({'trades': [50]})
+_DF_MARKET = pd.DataFrame({'market': ['data']})
+_DF_STOCKS = pd.DataFrame({'stocks': ['list']})
+_DF_BULK = pd.DataFrame({'bulk': ['prices']})
+
+# Read-only arguments passed to the client methods
+_ARGS_SEARCH_STOCK = MappingProxyType({'query': 'پترول'})
+_ARGS_PRICE_HISTORY = MappingProxyType({
+    'stock': 'خودرو',
+    'start_date': '1404-01-01',
+    'end_date': '1403-01-01',
+    'ignore_date': False,
+    'adjust_price': False,
+    'show_weekday': False,
+    'double_date': False
+})
+_ARGS_MARKET_INDEX = MappingProxyType({
+    'index_type': 'CWI',
+    'start_date': '1404-01-01',
+    'end_date': '1403-01-01',
+    'ignore_date': False,
+    'just_adj_close': False,
+    'show_weekday': False,
+    'double_date': False
+})
+_ARGS_INTRADAY_TRADES = MappingProxyType({
+    'stock': 'وخارزم',
+    'start_date': '1404-09-15',
+    'end_date': '1404-12-29',
+    'jalali_date': True,
+    'combined_datetime': False,
+    'show_progress': True
+})
+# get_market_watch takes no arguments
+_ARGS_MARKET_WATCH = MappingProxyType({})
+_ARGS_BUILD_STOCK_LIST = MappingProxyType({
+    'bourse': True,
+    'farabourse': True,
+    'payeh': True,
+    'detailed_list': True,
+    'show_progress': True,
+    'save_excel': True,
+    'save_csv': True,
+    'save_path': 'D:/FinPy-TSE Data/'
+})
+_ARGS_BULK_PRICE_DATA = MappingProxyType({
+    'stock_list': ['خودرو', 'پترول', 'فولاد'],
+    'param': 'Adj Final',
+    'jalali_date': True,
+    'save_excel': True,
+    'save_path': 'D:/FinPy-TSE Data/Price Panel/'
+})
+
+_SERVICES = (StockService, PriceService, MarketService, TradingService, DataService)
+
+_SERVICE_TYPES = {
+    'stock': StockService,
+    'price': PriceService,
+    'market': MarketService,
+    'trading': TradingService,
+    'data': DataService,
+}
+
+# client method, service attribute, service method, arguments, service result
+_DELEGATION_CASES = [
+    ("search_stock", "stock", "search", _ARGS_SEARCH_STOCK, _DF_RESULT),
+    ("get_price_history", "price", "get_history", _ARGS_PRICE_HISTORY, _DF_PRICE),
+    ("get_market_index", "market", "get_index_history", _ARGS_MARKET_INDEX, _DF_INDEX),
+    ("get_intraday_trades", "trading", "get_intraday_trades", _ARGS_INTRADAY_TRADES, _DF_TRADES),
+    ("get_market_watch", "market", "get_market_watch", _ARGS_MARKET_WATCH, _DF_MARKET),
+    ("build_stock_list", "data", "build_stock_list", _ARGS_BUILD_STOCK_LIST, _DF_STOCKS),
+    ("get_bulk_price_data", "data", "build_price_panel", _ARGS_BULK_PRICE_DATA, _DF_BULK),
+]
+
+
+@pytest.fixture(scope="module")
+def mock_services():
+    """Fixture to mock all services for the whole module."""
+    # Plain mocks skip spec introspection; test_services_have_correct_types
+    # checks the mocked methods exist on the real services
+    mocks = {service: MagicMock() for service in _SERVICES}
+    with patch.multiple(
+        'pytsetmc_api.client',
+        **{service.__name__: MagicMock(return_value=mock) for service, mock in mocks.items()}
+    ):
+        yield mocks
+
+
+@pytest.fixture(scope="module")
 def client(mock_services):
     """Fixture to create a TSETMCClient with mocked services."""
     return TSETMCClient()
 
 
+@pytest.fixture(autouse=True)
+def reset_mock_services(mock_services):
+    """Clear calls and return values set on the shared mocks by earlier tests."""
+    yield
+    for mock in mock_services.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+
 def test_tsetmc_client_initialization(client):
     """Test if TSETMCClient initializes correctly."""
     assert client is not None
@@ -35,133 +133,32 @@ def test_tsetmc_client_initialization(client):
     assert client.max_retries == 3
     
     # Check if services are initialized
-    assert isinstance(client.stock, MagicMock)
-    assert isinstance(client.price, MagicMock)
-    assert isinstance(client.market, MagicMock)
-    assert isinstance(client.trading, MagicMock)
-    assert isinstance(client.data, MagicMock)
-
-
-def test_search_stock(client):
-    """Test search_stock method."""
-    query = 'پترول'
-    expected_df = pd.DataFrame({'result': [1]})
-    client.stock.search.return_value = expected_df
-    
-    result_df = client.search_stock(query)
-    
-    client.stock.search.assert_called_once_with(query)
-    pd.testing.assert_frame_equal(result_df, expected_df)
-
-
-def test_get_price_history(client):
-    """Test get_price_history method."""
-    args = {
-        'stock': 'خودرو',
-        'start_date': '1404-01-01',
-        'end_date': '1403-01-01',
-        'ignore_date': False,
-        'adjust_price': False,
-        'show_weekday': False,
-        'double_date': False
-    }
-    expected_df = pd.DataFrame({'price': [100]})
-    client.price.get_history.return_value = expected_df
-    
-    result_df = client.get_price_history(**args)
-    
-    client.price.get_history.assert_called_once_with(**args)
-    pd.testing.assert_frame_equal(result_df, expected_df)
-
-
-def test_get_market_index(client):
-    """Test get_market_index method."""
-    args = {
-        'index_type': 'CWI',
-        'start_date': '1404-01-01',
-        'end_date': '1403-01-01',
-        'ignore_date': False,
-        'just_adj_close': False,
-        'show_weekday': False,
-        'double_date': False
-    }
-    expected_df = pd.DataFrame({'index': [1000]})
-    client.market.get_index_history.return_value = expected_df
-    
-    result_df = client.get_market_index(**args)
-    
-    client.market.get_index_history.assert_called_once_with(**args)
-    pd.testing.assert_frame_equal(result_df, expected_df)
-
-
-def test_get_intraday_trades(client):
-    """Test get_intraday_trades method."""
-    args = {
-        'stock': 'وخارزم',
-        'start_date': '1404-09-15',
-        'end_date': '1404-12-29',
-        'jalali_date': True,
-        'combined_datetime': False,
-        'show_progress': True
-    }
-    expected_df = pd.DataFrame({'trades': [50]})
-    client.trading.get_intraday_trades.return_value = expected_df
-    
-    result_df = client.get_intraday_trades(**args)
-    
-    client.trading.get_intraday_trades.assert_called_once_with(**args)
-    pd.testing.assert_frame_equal(result_df, expected_df)
-
-
-def test_get_market_watch(client):
-    """Test get_market_watch method."""
-    args = {'save_excel': True, 'save_path': 'D:/FinPy-TSE Data/MarketWatch'}
-    expected_df = pd.DataFrame({'market': ['data']})
-    client.market.get_market_watch.return_value = expected_df
-
-    result_df = client.get_market_watch(**args)
-
-    client.market.get_market_watch.assert_called_once_with(**args)
-    pd.testing.assert_frame_equal(result_df, expected_df)
-
-
-def test_build_stock_list(client):
-    """Test build_stock_list method."""
-    args = {
-        'bourse': True,
-        'farabourse': True,
-        'payeh': True,
-        'detailed_list': True,
-        'show_progress': True,
-        'save_excel': True,
-        'save_csv': True,
-        'save_path': 'D:/FinPy-TSE Data/'
-    }
-    expected_df = pd.DataFrame({'stocks': ['list']})
-    client.data.build_stock_list.return_value = expected_df
-
-    result_df = client.build_stock_list(**args)
+    services = (client.stock, client.price, client.market, client.trading, client.data)
+    assert all(isinstance(service, MagicMock) for service in services)
 
-    client.data.build_stock_list.assert_called_once_with(**args)
-    pd.testing.assert_frame_equal(result_df, expected_df)
 
+@pytest.mark.parametrize("client_method, service_attr, service_method, args, expected_df",
+                         _DELEGATION_CASES, ids=[case[0] for case in _DELEGATION_CASES])
+def test_delegation(client, client_method, service_attr, service_method, args, expected_df):
+    """Test each client method delegates to its service with the same arguments."""
+    service_mock = getattr(getattr(client, service_attr), service_method)
+    service_mock.return_value = expected_df
 
-def test_get_bulk_price_data(client):
-    """Test get_bulk_price_data method."""
-    args = {
-        'stock_list': ['خودرو', 'پترول', 'فولاد'],
-        'param': 'Adj Final',
-        'jalali_date': True,
-        'save_excel': True,
-        'save_path': 'D:/FinPy-TSE Data/Price Panel/'
-    }
-    expected_df = pd.DataFrame({'bulk': ['prices']})
-    client.data.build_price_panel.return_value = expected_df
+    result_df = getattr(client, client_method)(**args)
 
-    result_df = client.get_bulk_price_data(**args)
+    if client_method == 'search_stock':
+        # search_stock passes its query on positionally
+        service_mock.assert_called_once_with(*args.values())
+    else:
+        service_mock.assert_called_once_with(**args)
+    # The client hands back the service result untouched
+    assert result_df is expected_df
 
-    client.data.build_price_panel.assert_called_once_with(**args)
-    pd.testing.assert_frame_equal(result_df, expected_df)
+def test_services_have_correct_types():
+    """Test every service method the client delegates to exists on the real service."""
+    for _, service_attr, service_method, _, _ in _DELEGATION_CASES:
+        spec_mock = MagicMock(spec=_SERVICE_TYPES[service_attr])
+        assert callable(getattr(spec_mock, service_method))
 
 def test_client_repr(client):
     """Test the __repr__ method of the client."""
@@ -174,4 +171,4 @@ def test_client_context_manager():
         assert isinstance(client, TSETMCClient)
 
 if __name__ == "__main__": 
-    pytest.main() 
\ No newline at end of file
+    pytest.main([__file__])
\ No newline at end of file
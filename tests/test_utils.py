@@ -0,0 +1,104 @@
+import jdatetime
+import numpy as np
+import pytest
+import pandas as pd
+
+from pytsetmc_api.exceptions import TSETMCValidationError
+from pytsetmc_api.utils import (
+    _parse_jalali, chunk_iter, clean_persian_series, format_number, validate_jalali_date,
+)
+
+def test_clean_persian_series():
+    """Test column-wise cleaning, with non-string values becoming empty strings."""
+    series = pd.Series(["  بانك‌ ملت ", 5, None], dtype=object)
+    assert clean_persian_series(series).tolist() == ['بانک ملت', '', '']
+
+@pytest.mark.parametrize("series", [
+    pd.Series([np.nan, np.nan]),
+    pd.Series([1, 2], dtype=object),
+    pd.Series([1, 2]),
+], ids=["all_nan", "numeric_object", "numeric"])
+def test_clean_persian_series_without_strings(series):
+    """Test columns without any strings are cleaned instead of raising."""
+    assert clean_persian_series(series).tolist() == ['', '']
+
+def test_chunk_iter_generator():
+    """Test a generator is consumed lazily, one chunk at a time."""
+    consumed = []
+    def numbers():
+        for i in range(5):
+            consumed.append(i)
+            yield i
+    
+    chunks = chunk_iter(numbers(), 2)
+    assert consumed == []
+    assert next(chunks) == [0, 1]
+    assert consumed == [0, 1]
+    assert list(chunks) == [[2, 3], [4]]
+
+@pytest.mark.parametrize("data, chunk_size, expected", [
+    (range(6), 3, [[0, 1, 2], [3, 4, 5]]),
+    (range(7), 3, [[0, 1, 2], [3, 4, 5], [6]]),
+    (range(2), 3, [[0, 1]]),
+    ([], 3, []),
+], ids=["exact_multiple", "trailing_partial", "shorter_than_chunk", "empty"])
+def test_chunk_iter_sizes(data, chunk_size, expected):
+    """Test chunking with and without a trailing partial chunk."""
+    assert list(chunk_iter(data, chunk_size)) == expected
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_chunk_iter_invalid_size(chunk_size):
+    """Test a non-positive chunk size is rejected up front."""
+    with pytest.raises(ValueError):
+        chunk_iter([1, 2], chunk_size)
+
+@pytest.mark.parametrize("date_string", [
+    "1402-01-05",
+    "۱۴۰۲-۰۱-۰۵",
+    "1402/01/05",
+    "1402.1.5",
+    " 1402-01-05 ",
+], ids=["ascii", "persian_digits", "slashes", "dots_unpadded", "padded"])
+def test_parse_jalali_formats(date_string):
+    """Test the ASCII fast path and the normalizing path agree."""
+    assert _parse_jalali(date_string) == ("1402-01-05", jdatetime.date(1402, 1, 5))
+
+def test_parse_jalali_leap_day():
+    """Test Esfand 30 is accepted only in a leap year."""
+    assert _parse_jalali("1403-12-30")[0] == "1403-12-30"
+    with pytest.raises(TSETMCValidationError):
+        _parse_jalali("1402-12-30")
+
+@pytest.mark.parametrize("date_string", ["1402-12-30", "1402-01", "1200-01-01", "", None])
+def test_parse_jalali_error_names_field(date_string):
+    """Test errors name the field being validated, also when served from the cache."""
+    for field_name in ("start_date", "end_date"):
+        with pytest.raises(TSETMCValidationError, match=field_name) as exc_info:
+            _parse_jalali(date_string, field_name)
+        assert exc_info.value.field_name == field_name
+
+@pytest.mark.parametrize("number, locale, expected", [
+    (1234567.89, "fa", "۱,۲۳۴,۵۶۷.۸۹"),
+    (1234567.89, "en", "1,234,567.89"),
+    (9876543210, "fa", "۹,۸۷۶,۵۴۳,۲۱۰"),
+    (-1234.5, "fa", "-۱,۲۳۴.۵۰"),
+    (0, "fa", "۰"),
+    (None, "fa", ""),
+])
+def test_format_number(number, locale, expected):
+    """Test thousands separators are kept and every digit is translated."""
+    assert format_number(number, locale) == expected
+
+@pytest.mark.parametrize("date_string", [
+    "۱۴۰۲/۰۱/۰۵",
+    "١٤٠٢.٠١.٠٥",
+    "1402/1/5",
+    "1402.01.05",
+], ids=["persian_slashes", "arabic_dots", "ascii_slashes", "ascii_dots"])
+def test_validate_jalali_date_digits_and_separators(date_string):
+    """Test Persian and Arabic-Indic digits and slash or dot separators normalize alike."""
+    assert validate_jalali_date(date_string) == "1402-01-05"
+
+
+if __name__ == "__main__": 
+    pytest.main([__file__])